@@ -194,7 +194,7 @@ export async function updateUserList(profileId, forceUpdate = false) {
   }
   
   // 3. 提取用户列表（需要用户先手动导航到特别关注分组页）
-  const userListResult = await extractCompleteUserList(profileId, { autoScroll: true });
+  const userListResult = await extractCompleteUserList(profileId, { autoScroll: true, url: pageState.url || undefined });
   
   if (!userListResult.success) {
     return {
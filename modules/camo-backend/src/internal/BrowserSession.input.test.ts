@@ -1,4 +1,4 @@
-import test from 'node:test';
+import test, { mock } from 'node:test';
 import assert from 'node:assert/strict';
 import { BrowserSession } from './BrowserSession.js';
 
@@ -11,6 +11,26 @@ function setEnv(key: string, value: string) {
   };
 }
 
+// 输入超时下限为 1000ms（测试里设的 80ms 会被抬高）：用 mock timers 快进超时，而不是真实等待
+async function withFastTimers<T>(run: () => Promise<T>): Promise<T> {
+  mock.timers.enable({ apis: ['setTimeout'] });
+  try {
+    let settled = false;
+    const pending = run();
+    pending.then(
+      () => { settled = true; },
+      () => { settled = true; },
+    );
+    while (!settled) {
+      await new Promise((resolve) => setImmediate(resolve));
+      mock.timers.tick(1000);
+    }
+    return await pending;
+  } finally {
+    mock.timers.reset();
+  }
+}
+
 function createSessionWithPage(page: any) {
   const session = new BrowserSession({ profileId: `test-input-${Date.now()}` }) as any;
   session.ensurePrimaryPage = async () => page;
@@ -178,7 +198,7 @@ test('mouseClick falls back to down/up when direct click times out', async () =>
       },
     };
     const session = createSessionWithPage(page);
-    await session.mouseClick({ x: 11, y: 22, delay: 0 });
+    await withFastTimers(() => session.mouseClick({ x: 11, y: 22, delay: 0 }));
     assert.equal(calls.includes('click_retry'), true);
   } finally {
     restoreReadySettle();
@@ -286,7 +306,7 @@ test('mouseWheel retries with refreshed active page after timeout', async () =>
       ensurePrimaryPageCalls += 1;
       return ensurePrimaryPageCalls <= 3 ? page1 : page2;
     };
-    await session.mouseWheel({ deltaY: 360 });
+    await withFastTimers(() => session.mouseWheel({ deltaY: 360 }));
     assert.equal(calls.length, 1);
     assert.ok(ensurePrimaryPageCalls >= 4);
   } finally {
@@ -323,7 +343,7 @@ test('mouseWheel falls back to keyboard paging when wheel keeps timing out', asy
     const session = new BrowserSession({ profileId: `test-input-fallback-${Date.now()}` }) as any;
     session.ensureInputReady = async () => {};
     session.ensurePrimaryPage = async () => page;
-    await session.mouseWheel({ deltaY: 420 });
+    await withFastTimers(() => session.mouseWheel({ deltaY: 420 }));
     assert.deepEqual(calls, ['press:PageDown']);
   } finally {
     restoreReadySettle();
@@ -7,6 +7,7 @@ import { ElementHandle, Page } from 'playwright';
 export class ElementRegistry {
   private elements: Map<string, ElementHandle> = new Map();
   private pageMap: Map<string, string> = new Map(); // elementId -> pageId (for cleanup)
+  private pageElements: Map<string, Set<string>> = new Map(); // pageId -> elementIds（按页批量释放，避免全表扫描）
 
   /**
    * 注册元素并返回唯一 ID
@@ -16,6 +17,12 @@ export class ElementRegistry {
     this.elements.set(id, element);
     if (pageId) {
       this.pageMap.set(id, pageId);
+      let ids = this.pageElements.get(pageId);
+      if (!ids) {
+        ids = new Set();
+        this.pageElements.set(pageId, ids);
+      }
+      ids.add(id);
     }
     return id;
   }
@@ -31,15 +38,9 @@ export class ElementRegistry {
    * 释放元素
    */
   public async release(id: string): Promise<void> {
-    const element = this.elements.get(id);
+    const element = this.detach(id);
     if (element) {
-      try {
-        await element.dispose();
-      } catch (e) {
-        // Ignore disposal errors
-      }
-      this.elements.delete(id);
-      this.pageMap.delete(id);
+      await this.disposeAll([element]);
     }
   }
 
@@ -47,20 +48,50 @@ export class ElementRegistry {
    * 清理特定页面的所有元素
    */
   public async clearPage(pageId: string): Promise<void> {
-    const toRemove: string[] = [];
-    for (const [id, pid] of this.pageMap.entries()) {
-      if (pid === pageId) {
-        toRemove.push(id);
-      }
+    const ids = this.pageElements.get(pageId);
+    if (!ids) return;
+    const handles: ElementHandle[] = [];
+    for (const id of Array.from(ids)) {
+      const element = this.detach(id);
+      if (element) handles.push(element);
     }
-    await Promise.all(toRemove.map(id => this.release(id)));
+    await this.disposeAll(handles);
   }
 
   /**
    * 清理所有元素
    */
   public async clearAll(): Promise<void> {
-    const ids = Array.from(this.elements.keys());
-    await Promise.all(ids.map(id => this.release(id)));
+    const handles = Array.from(this.elements.values());
+    this.elements.clear();
+    this.pageMap.clear();
+    this.pageElements.clear();
+    await this.disposeAll(handles);
+  }
+
+  /**
+   * 先同步移除映射，再统一释放，释放期间的新注册不会被误删
+   */
+  private detach(id: string): ElementHandle | undefined {
+    const element = this.elements.get(id);
+    this.elements.delete(id);
+    const pageId = this.pageMap.get(id);
+    if (pageId !== undefined) {
+      this.pageMap.delete(id);
+      const ids = this.pageElements.get(pageId);
+      ids?.delete(id);
+      if (ids && !ids.size) this.pageElements.delete(pageId);
+    }
+    return element;
+  }
+
+  private async disposeAll(handles: ElementHandle[]): Promise<void> {
+    await Promise.all(
+      handles.map((element) =>
+        element.dispose().catch(() => {
+          // Ignore disposal errors
+        }),
+      ),
+    );
   }
 }
@@ -0,0 +1,411 @@
+import test from 'node:test';
+import assert from 'node:assert/strict';
+import { ContainerMatcher } from './container-matcher.js';
+
+function createRegistry(containers: Record<string, any>) {
+  return {
+    getContainersForUrl() {
+      return containers;
+    },
+  };
+}
+
+function createRootPage(present: Set<string>, options: { onWait?: () => void; guardChild?: string } = {}) {
+  const host = createElement('DIV');
+  if (options.guardChild) {
+    (host as any).querySelector = (sel: string) => (sel === options.guardChild ? {} : null);
+  } else {
+    (host as any).querySelector = () => null;
+  }
+  const page: any = createDomPage({
+    querySelector: () => null,
+    querySelectorAll: (css: string) => (present.has(css) ? [host] : []),
+  });
+  page.calls = [] as string[];
+  page.url = () => 'https://example.com/home';
+  page.waitForLoadState = async () => {};
+  page.waitForTimeout = async (ms: number) => {
+    page.calls.push(`sleep:${ms}`);
+  };
+  page.waitForFunction = async (_fn: any, arg?: any, opts?: any) => {
+    page.calls.push(`waitForFunction:${Array.isArray(arg) ? 'candidates' : 'ready'}:${opts?.timeout}`);
+    if (Array.isArray(arg)) {
+      if (!options.onWait) throw new Error('Timeout exceeded');
+      options.onWait();
+    }
+    return true;
+  };
+  return page;
+}
+
+const containers = {
+  home: { id: 'home', name: 'Home', selectors: [{ css: '.feed-root' }] },
+};
+
+test('matchRoot waits for root selector instead of fixed sleeps', async () => {
+  const present = new Set<string>();
+  const page = createRootPage(present, { onWait: () => present.add('.feed-root') });
+  try {
+    const matcher = new ContainerMatcher(createRegistry(containers) as any);
+    const match = await matcher.matchRoot({ ensurePage: async () => page }, { url: 'https://example.com/home' });
+
+    assert.equal(match?.container.id, 'home');
+    assert.equal(match?.container.match_count, 1);
+    assert.equal(match?.container.selector_count, 1);
+    assert.equal('definition' in match!.container, false);
+    assert.equal(page.calls.filter((c: string) => c.startsWith('sleep:')).length, 0);
+    assert.ok(page.calls.includes('waitForFunction:ready:12000'));
+    assert.ok(page.calls.includes('waitForFunction:candidates:900'));
+  } finally {
+    page.restore();
+  }
+});
+
+test('matchRoot returns null when root never appears', async () => {
+  const page = createRootPage(new Set());
+  try {
+    const matcher = new ContainerMatcher(createRegistry(containers) as any);
+    const match = await matcher.matchRoot({ ensurePage: async () => page }, { url: 'https://example.com/home' });
+    assert.equal(match, null);
+  } finally {
+    page.restore();
+  }
+});
+
+test('matchRoot checks descendant guards inside the page probe', async () => {
+  const guarded = {
+    feed: {
+      id: 'feed',
+      selectors: [{ css: '.feed-root' }],
+      metadata: { required_descendants_any: ['.note-item'], excluded_descendants_any: ['.login-mask'] },
+    },
+  };
+  const okPage = createRootPage(new Set(['.feed-root']), { guardChild: '.note-item' });
+  try {
+    const matcher = new ContainerMatcher(createRegistry(guarded) as any);
+    const match = await matcher.matchRoot(
+      { ensurePage: async () => okPage },
+      { url: 'https://example.com/home' },
+      { includeDefinition: true },
+    );
+    assert.equal(match?.container.id, 'feed');
+    assert.equal(match?.container.definition, guarded.feed);
+  } finally {
+    okPage.restore();
+  }
+  const blockedPage = createRootPage(new Set(['.feed-root']), { guardChild: '.login-mask' });
+  try {
+    const matcher = new ContainerMatcher(createRegistry(guarded) as any);
+    const match = await matcher.matchRoot({ ensurePage: async () => blockedPage }, { url: 'https://example.com/home' });
+    assert.equal(match, null);
+  } finally {
+    blockedPage.restore();
+  }
+});
+
+function createDomPage(document: any) {
+  const previous = { window: (globalThis as any).window, document: (globalThis as any).document };
+  (globalThis as any).window = {};
+  (globalThis as any).document = document;
+  const page = {
+    evaluateCalls: 0,
+    async evaluate(fn: any, arg?: any) {
+      page.evaluateCalls += 1;
+      // 字符串脚本按页面全局作用域执行
+      return typeof fn === 'string' ? (0, eval)(fn) : fn(arg);
+    },
+    async $$() {
+      throw new Error('$$ should not be used');
+    },
+    restore() {
+      (globalThis as any).window = previous.window;
+      (globalThis as any).document = previous.document;
+    },
+  };
+  return page;
+}
+
+function createElement(tagName: string, parent: any = null) {
+  const el: any = { tagName, id: '', classList: [], textContent: ` ${tagName} text `, parentElement: parent, children: [] };
+  if (parent) parent.children.push(el);
+  return el;
+}
+
+test('collectContainerMatches resolves all containers through the installed page helper', async () => {
+  const root = createElement('DIV');
+  const list = createElement('UL', root);
+  const itemA = createElement('LI', list);
+  const itemB = createElement('LI', list);
+  const bySelector: Record<string, any[]> = { '#root': [root], '.item': [itemA, itemB], '.list': [list] };
+  const page = createDomPage({
+    querySelector: (css: string) => bySelector[css]?.[0] || null,
+    querySelectorAll: (css: string) => {
+      if (css === '[bad') throw new Error('invalid selector');
+      return bySelector[css] || [];
+    },
+  });
+  try {
+    const matcher = new ContainerMatcher(createRegistry({}) as any) as any;
+    const summary = await matcher.collectContainerMatches(
+      page,
+      {
+        list: { id: 'list', name: 'List', selectors: [{ css: '[bad' }, { css: '.list' }] },
+        item: { id: 'item', selectors: [{ css: '.item' }] },
+        missing: { id: 'missing', selectors: [{ css: '.none' }] },
+      },
+      '#root',
+      4,
+    );
+    assert.deepEqual(summary.list.selectors, ['.list']);
+    assert.equal(summary.list.container.name, 'List');
+    assert.equal(summary.item.match_count, 2);
+    assert.deepEqual(
+      summary.item.nodes.map((node: any) => node.dom_path),
+      ['root/0/0', 'root/0/1'],
+    );
+    assert.equal(summary.item.nodes[0].dom_root_selector, '#root');
+    assert.equal(summary.item.nodes[0].textSnippet, 'LI text');
+    assert.equal(summary.missing.match_count, 0);
+    assert.deepEqual(summary.missing.nodes, []);
+
+    // helper 已安装到页面：后续调用只需一次 evaluate
+    const before = page.evaluateCalls;
+    await matcher.collectContainerMatches(page, { item: { id: 'item', selectors: [{ css: '.item' }] } }, '#root', 4);
+    assert.equal(page.evaluateCalls - before, 1);
+  } finally {
+    page.restore();
+  }
+});
+
+test('matchesPagePatterns honours include/exclude globs and literal substrings', () => {
+  const matcher = new ContainerMatcher(createRegistry({}) as any) as any;
+  const container = { id: 'search', page_patterns: ['*/search_result*', '!*/explore/*', 'weibo.com'] };
+  const check = (url: string) => matcher.matchesPagePatterns(container, url, new URL(url).pathname);
+  assert.equal(check('https://www.xiaohongshu.com/search_result?keyword=a'), true);
+  assert.equal(check('https://www.xiaohongshu.com/explore/123'), false);
+  assert.equal(check('https://s.weibo.com/home'), true);
+  assert.equal(check('https://www.xiaohongshu.com/user/1'), false);
+  assert.equal(matcher.matchesPagePatterns({ id: 'any' }, 'https://a.com/', '/'), true);
+});
+
+test('legacy DOM outline walks breadth-first within the node budget', async () => {
+  const body = createElement('BODY');
+  const section = createElement('SECTION', body);
+  const aside = createElement('ASIDE', body);
+  createElement('P', section);
+  createElement('P', section);
+  createElement('SPAN', aside);
+  const page = createDomPage({ body, querySelector: (css: string) => (css === 'body' ? body : null) });
+  try {
+    const matcher = new ContainerMatcher(createRegistry({}) as any) as any;
+    const full = await matcher.captureDomTreeLegacy(page, 'body', 4, 8, 100);
+    assert.deepEqual(
+      full.children.map((child: any) => [child.path, child.children.length]),
+      [['root/0', 2], ['root/1', 1]],
+    );
+    const limited = await matcher.captureDomTreeLegacy(page, 'body', 4, 8, 4);
+    assert.deepEqual(limited.children.map((child: any) => child.path), ['root/0', 'root/1']);
+    assert.deepEqual(limited.children[0].children.map((child: any) => child.path), ['root/0/0']);
+    assert.deepEqual(limited.children[1].children, []);
+    const branch = await matcher.captureDomBranchLegacy(page, 'body', 'root/0', 4, 8, 100);
+    assert.equal(branch.tag, 'SECTION');
+    assert.deepEqual(branch.children.map((child: any) => child.path), ['root/0/0', 'root/0/1']);
+    assert.equal(await matcher.captureDomBranchLegacy(page, 'body', 'root/5', 4, 8, 100), null);
+  } finally {
+    page.restore();
+  }
+});
+
+test('captureDomTreeWithRetry waits for the root to attach instead of sleeping', async () => {
+  const sleeps: number[] = [];
+  const waited: string[] = [];
+  let attached = false;
+  const page = {
+    async evaluate() {
+      return null;
+    },
+    async waitForTimeout(ms: number) {
+      sleeps.push(ms);
+    },
+    async waitForFunction(_fn: any, css: string, opts: any) {
+      waited.push(`${css}:${opts.timeout}`);
+      if (css !== '.feed') throw new Error('Timeout exceeded');
+      attached = true;
+      return true;
+    },
+  };
+  const matcher = new ContainerMatcher(createRegistry({}) as any) as any;
+  const captured: Array<string | undefined> = [];
+  matcher.captureDomTree = async (_page: any, candidate?: string) => {
+    captured.push(candidate);
+    return attached && candidate === '.feed' ? { path: 'root', children: [] } : null;
+  };
+  const tree = await matcher.captureDomTreeWithRetry(page, '.feed', 2, 2);
+
+  assert.equal(tree.path, 'root');
+  assert.deepEqual(captured, ['.feed', '.feed']);
+  assert.deepEqual(waited, ['.feed:1250']);
+  assert.equal(sleeps.length, 0);
+
+  // 候选全部不可用时：每个 selector 候选最多一次等待，最终回落到 fallback
+  attached = false;
+  waited.length = 0;
+  captured.length = 0;
+  matcher.captureDomTree = async (_page: any, candidate?: string) => {
+    captured.push(candidate);
+    return null;
+  };
+  matcher.captureFallbackDomTree = async () => ({ path: 'root', fallback: true, children: [] });
+  const fallback = await matcher.captureDomTreeWithRetry(page, '.missing', 2, 2);
+  assert.equal(fallback.fallback, true);
+  assert.deepEqual(captured, ['.missing', '#app', 'body', undefined]);
+  assert.deepEqual(waited, ['.missing:1250', '#app:1250', 'body:1250']);
+});
+
+test('matchRoot skips page queries when no root container matches the URL', async () => {
+  const page = createRootPage(new Set(['.feed-root']));
+  try {
+    const scoped = { home: { id: 'home', selectors: [{ css: '.feed-root' }], page_patterns: ['*/explore*'] } };
+    const matcher = new ContainerMatcher(createRegistry(scoped) as any);
+    const match = await matcher.matchRoot({ ensurePage: async () => page }, { url: 'https://example.com/home' });
+    assert.equal(match, null);
+    assert.equal(page.evaluateCalls, 0);
+    assert.ok(!page.calls.some((c: string) => c.startsWith('waitForFunction:candidates')));
+  } finally {
+    page.restore();
+  }
+});
+
+test('inspectTree does not re-query a preferred root that just failed', async () => {
+  const present = new Set<string>(['.other-root']);
+  const page = createRootPage(present);
+  const probed: string[] = [];
+  const originalEvaluate = page.evaluate;
+  page.evaluate = async (fn: any, arg?: any) => {
+    // 首次调用会因 helper 未安装而重放一次，只统计安装后的实际查询
+    if ((globalThis as any).window.__webautoInspector) {
+      if (arg?.method === 'probe') probed.push(arg.args.css);
+      if (arg?.method === 'first') probed.push(...arg.args.map((spec: any) => spec.css));
+    }
+    return originalEvaluate(fn, arg);
+  };
+  try {
+    const matcher = new ContainerMatcher(
+      createRegistry({
+        preferred: { id: 'preferred', selectors: [{ css: '.preferred-root' }] },
+        other: { id: 'other', selectors: [{ css: '.other-root' }] },
+      }) as any,
+    ) as any;
+    matcher.captureDomTreeWithRetry = async () => ({ path: 'root', children: [] });
+    const snapshot = await matcher.inspectTree(
+      { ensurePage: async () => page },
+      { url: 'https://example.com/home' },
+      { root_container_id: 'preferred' },
+    );
+    assert.equal(snapshot.root_match.container.id, 'other');
+    assert.equal(probed.filter((css) => css === '.preferred-root').length, 1);
+  } finally {
+    page.restore();
+  }
+});
+
+test('dom annotations are built per path and attached only to matched nodes', () => {
+  const matcher = new ContainerMatcher(createRegistry({}) as any) as any;
+  const tree = {
+    path: 'root',
+    containers: [{ container_id: 'stale' }],
+    children: [
+      { path: 'root/0', children: [{ path: 'root/0/0', children: [] }] },
+      { path: 'root/1', children: [] },
+    ],
+  };
+  const annotations = matcher.buildDomAnnotations({
+    item: { container: { id: 'item' }, nodes: [{ dom_path: 'root/0/0', selector: '.item' }, { dom_path: null }] },
+    empty: { container: { id: 'empty' }, nodes: [] },
+  });
+  assert.deepEqual([...annotations.keys()], ['root/0/0']);
+  matcher.attachDomAnnotations(tree, annotations);
+  assert.equal('containers' in tree, false);
+  assert.equal('containers' in tree.children[0], false);
+  assert.deepEqual((tree.children[0].children[0] as any).containers, [
+    { container_id: 'item', container_name: 'item', selector: '.item' },
+  ]);
+  assert.equal('containers' in tree.children[1], false);
+});
+
+test('selectorToCss derives css from id or classes', () => {
+  const matcher = new ContainerMatcher(createRegistry({}) as any) as any;
+  const byClasses = { classes: ['feeds-page', 'active'] };
+  assert.equal(matcher.selectorToCss({ css: '.a', id: 'b' }), '.a');
+  assert.equal(matcher.selectorToCss({ id: 'app' }), '#app');
+  assert.equal(matcher.selectorToCss(byClasses), '.feeds-page.active');
+  assert.equal(matcher.selectorToCss(byClasses), '.feeds-page.active');
+  assert.equal(matcher.selectorToCss({ variant: 'primary' }), null);
+});
+
+test('inspectTree collects matches and captures the DOM in one snapshot call', async () => {
+  const root = createElement('DIV');
+  const item = createElement('LI', root);
+  const present = new Set<string>(['.feed-root']);
+  const page = createRootPage(present);
+  const byCss: Record<string, any[]> = { '.feed-root': [root], '.feed-item': [item] };
+  (globalThis as any).document.querySelector = (css: string) => byCss[css]?.[0] || null;
+  (globalThis as any).document.querySelectorAll = (css: string) => byCss[css] || [];
+  const forcePathsSeen: string[][] = [];
+  const methods: string[] = [];
+  const originalEvaluate = page.evaluate;
+  page.evaluate = async (fn: any, arg?: any) => {
+    if (arg?.method && (globalThis as any).window.__webautoInspector) methods.push(arg.method);
+    return originalEvaluate(fn, arg);
+  };
+  try {
+    (globalThis as any).window.__camoRuntime = {
+      dom: {
+        getBranch: (_path: string, opts: any) => {
+          forcePathsSeen.push(opts.forcePaths);
+          return { node: { path: 'root', tag: 'div', children: [{ path: 'root/0', tag: 'li', children: [] }] } };
+        },
+      },
+    };
+    const matcher = new ContainerMatcher(
+      createRegistry({
+        feed: { id: 'feed', selectors: [{ css: '.feed-root' }], children: ['feed.item'] },
+        'feed.item': { id: 'feed.item', selectors: [{ css: '.feed-item' }] },
+      }) as any,
+    ) as any;
+    matcher.captureDomTreeWithRetry = async () => {
+      throw new Error('fallback capture should not run');
+    };
+    const snapshot = await matcher.inspectTree({ ensurePage: async () => page }, { url: 'https://example.com/home' });
+
+    assert.deepEqual(methods, ['first', 'snapshot']);
+    assert.deepEqual(forcePathsSeen, [['root', 'root/0']]);
+    assert.equal(snapshot.dom_tree.tag, 'DIV');
+    assert.deepEqual(snapshot.dom_tree.children[0].containers.map((c: any) => c.container_id), ['feed.item']);
+    assert.equal(snapshot.matches['feed.item'].match_count, 1);
+  } finally {
+    page.restore();
+  }
+});
+
+test('matchRoot queries a selector shared by several roots only once', async () => {
+  const queried: string[] = [];
+  const page = createRootPage(new Set(['#app']), { guardChild: '.note-item' });
+  const querySelectorAll = (globalThis as any).document.querySelectorAll;
+  (globalThis as any).document.querySelectorAll = (css: string) => {
+    queried.push(css);
+    return querySelectorAll(css);
+  };
+  try {
+    const shared = {
+      login: { id: 'login', selectors: [{ css: '#app' }], metadata: { required_descendants_any: ['.login-box'] } },
+      feed: { id: 'feed', selectors: [{ css: '#app' }], metadata: { required_descendants_any: ['.note-item'] } },
+    };
+    const matcher = new ContainerMatcher(createRegistry(shared) as any);
+    const match = await matcher.matchRoot({ ensurePage: async () => page }, { url: 'https://example.com/home' });
+    assert.equal(match?.container.id, 'feed');
+    assert.deepEqual(queried, ['#app']);
+  } finally {
+    page.restore();
+  }
+});
@@ -1,21 +1,16 @@
 import {
   ContainerRegistry,
-  ContainerDefinition,
-  SelectorDefinition,
+  type ContainerDefinition,
+  type SelectorDefinition,
 } from '../../../container-registry/src/index.js';
-
-export interface AutomationElementHandle {
-  evaluate<T = any, A = any>(fn: (element: any, arg?: A) => T, arg?: A): Promise<T>;
-  dispose(): Promise<void>;
-}
+import { logDebug } from '../../../../modules/logging/src/index.js';
 
 export interface AutomationPage {
   url(): string;
   waitForLoadState(state: any, options?: any): Promise<void>;
   waitForTimeout(ms: number): Promise<void>;
-  waitForFunction(fn: (...args: any[]) => any, options?: any): Promise<any>;
-  evaluate<T = any, A = any>(fn: (arg?: A) => T, arg?: A): Promise<T>;
-  $$(selector: string): Promise<AutomationElementHandle[]>;
+  waitForFunction<A = any>(fn: (arg?: A) => any, arg?: A, options?: any): Promise<any>;
+  evaluate<T = any, A = any>(fn: ((arg?: A) => T) | string, arg?: A): Promise<T>;
 }
 
 export interface AutomationSession {
@@ -27,12 +22,417 @@ export interface ContainerMatchResult {
   match_details: Record<string, any>;
 }
 
+interface CompiledPatternGroup {
+  test(value: string): boolean;
+}
+
+interface CompiledPagePatterns {
+  include: CompiledPatternGroup | null;
+  exclude: CompiledPatternGroup | null;
+}
+
+// page_patterns 预编译结果：按 patterns 数组缓存（容器定义在 registry 缓存期内复用同一对象）。
+// 不含通配符的 pattern 直接按子串匹配（已覆盖整串相等），含通配符的合并成一个整串匹配的正则
+const compiledPatternLists = new WeakMap<readonly unknown[], CompiledPagePatterns>();
+
+function compilePatternGroup(patterns: string[]): CompiledPatternGroup | null {
+  if (!patterns.length) return null;
+  const literals = patterns.filter((pattern) => !pattern.includes('*'));
+  const globs = patterns.filter((pattern) => pattern.includes('*'));
+  const glob = globs.length
+    ? new RegExp(
+        globs
+          .map((pattern) => `(?:^${pattern.replace(/[.+^${}()|[\]\\]/g, '\\$&').replace(/\*/g, '.*')}$)`)
+          .join('|'),
+      )
+    : null;
+  return {
+    test: (value: string) => literals.some((literal) => value.includes(literal)) || (glob !== null && glob.test(value)),
+  };
+}
+
+function compilePagePatterns(patterns: readonly unknown[]) {
+  const cached = compiledPatternLists.get(patterns);
+  if (cached) return cached;
+  const includes: string[] = [];
+  const excludes: string[] = [];
+  for (const pattern of patterns) {
+    if (typeof pattern !== 'string') continue;
+    if (pattern.startsWith('!')) {
+      excludes.push(pattern.slice(1));
+    } else {
+      includes.push(pattern);
+    }
+  }
+  const compiled = { include: compilePatternGroup(includes), exclude: compilePatternGroup(excludes) };
+  compiledPatternLists.set(patterns, compiled);
+  return compiled;
+}
+
+// URL 解析结果按原始字符串缓存：一次匹配内每个容器的 page_patterns 校验都需要 hostname，
+// 同一页面 URL 会被反复解析
+const parsedPageUrls = new Map<string, { path: string; host: string }>();
+const PARSED_URL_LIMIT = 512;
+
+function parsePageUrl(raw: string) {
+  const cached = parsedPageUrls.get(raw);
+  if (cached) return cached;
+  let parsed: { path: string; host: string };
+  try {
+    const url = new URL(raw);
+    parsed = { path: url.pathname || '/', host: url.hostname || '' };
+  } catch {
+    parsed = { path: raw, host: '' };
+  }
+  if (parsedPageUrls.size >= PARSED_URL_LIMIT) {
+    parsedPageUrls.clear();
+  }
+  parsedPageUrls.set(raw, parsed);
+  return parsed;
+}
+
+interface DomAnnotation {
+  container_id: string;
+  container_name?: string;
+  selector?: string;
+}
+
+const containerScores = new WeakMap<ContainerDefinition, number>();
+// 根容器索引：按容器表缓存（registry 缓存期内返回同一对象），已按得分降序排列，
+// 并预先展开每个根容器的 css + guards；匹配时只需做 page_patterns 过滤，无需每次遍历全部子容器再排序
+interface RootContainerEntry {
+  id: string;
+  container: ContainerDefinition;
+  specs: RootMatchSpec[];
+}
+const rootContainerIndex = new WeakMap<Record<string, ContainerDefinition>, RootContainerEntry[]>();
+// 按 id 层级推断的子容器索引，按容器表缓存
+const implicitChildIndex = new WeakMap<Record<string, ContainerDefinition>, Map<string, string[]>>();
+// required/excluded descendants guards 按 metadata 对象缓存；无 guards 的容器共用同一个空结果
+interface ContainerGuards {
+  req: string[];
+  excl: string[];
+}
+const NO_GUARDS: ContainerGuards = Object.freeze({ req: [], excl: [] }) as ContainerGuards;
+const containerGuards = new WeakMap<Record<string, any>, ContainerGuards>();
+// 由 id / classes 拼出的 css 按 selector 对象缓存（css 字段直接返回，无需缓存）
+const selectorCssCache = new WeakMap<SelectorDefinition, string | null>();
+
+// DOM 捕获：候选根节点首次捕获失败后，等待其挂载的最长时间
+const DOM_ATTACH_WAIT_MS = 1250;
+
+// legacy DOM outline 的节点上限：限制单次 page.evaluate 的序列化体积（maxChildren^maxDepth 可能非常大）
+const DEFAULT_NODE_BUDGET = 2000;
+const MAX_NODE_BUDGET = 10000;
+
+interface DomOutlineConfig {
+  selector: string | null;
+  path: string | null;
+  fallbackRoot?: boolean;
+  maxDepth: number;
+  maxChildren: number;
+  nodeBudget: number;
+}
+
+/**
+ * 在页面内执行（通过 page.evaluate 传入，不能引用外部作用域）。
+ * 按广度优先迭代生成 DOM outline，节点数达到 nodeBudget 后停止展开，优先保留浅层结构。
+ */
+function outlineDomInPage(config: DomOutlineConfig): any {
+  let root: Element | null = null;
+  if (config.fallbackRoot) {
+    root = document.body || document.documentElement;
+  } else if (config.selector) {
+    root = document.querySelector(config.selector);
+  } else {
+    root = document.body;
+  }
+  if (!root) return null;
+
+  let rootPath = 'root';
+  if (config.path) {
+    const tokens = config.path.split('/').filter((token) => token.length);
+    if (!tokens.length || tokens[0] === '__root__') tokens[0] = 'root';
+    if (tokens[0] !== 'root') tokens.unshift('root');
+    for (let i = 1; i < tokens.length; i++) {
+      const idx = Number(tokens[i]);
+      const children = root!.children;
+      if (!Number.isFinite(idx) || idx < 0 || !children || idx >= children.length) {
+        return null;
+      }
+      root = children[idx];
+    }
+    rootPath = tokens.join('/');
+  }
+
+  const describe = (element: Element, path: string) => ({
+    path,
+    tag: element.tagName,
+    id: element.id || null,
+    classes: Array.from(element.classList || []),
+    childCount: element.children?.length || 0,
+    textSnippet: (element.textContent || '').trim().slice(0, 80),
+    children: [] as any[],
+  });
+
+  let budget = Math.max(1, Number(config.nodeBudget) || 1);
+  const rootMeta = describe(root!, rootPath);
+  budget -= 1;
+  const queue: Array<{ element: Element; meta: any; depth: number }> = [{ element: root!, meta: rootMeta, depth: 0 }];
+  for (let head = 0; head < queue.length && budget > 0; head++) {
+    const { element, meta, depth } = queue[head];
+    if (depth >= config.maxDepth) continue;
+    const children = element.children;
+    if (!children) continue;
+    const limit = Math.min(children.length, config.maxChildren);
+    for (let i = 0; i < limit && budget > 0; i++) {
+      const childMeta = describe(children[i], `${meta.path}/${i}`);
+      budget -= 1;
+      meta.children.push(childMeta);
+      queue.push({ element: children[i], meta: childMeta, depth: depth + 1 });
+    }
+  }
+  return rootMeta;
+}
+
+interface CollectMatchesArgs {
+  payload: Array<{ cid: string; selectors: string[] }>;
+  root: string | null;
+  maxNodes: number;
+}
+
+interface CollectedMatch {
+  selectors: string[];
+  match_count: number;
+  nodes: any[];
+}
+
+/**
+ * 在页面内执行：一次性完成所有容器 selector 的查询与节点描述。
+ */
+function collectMatchesInPage(args: CollectMatchesArgs): Record<string, CollectedMatch> {
+  let resolvedRoot: Element | null = null;
+  if (args.root) {
+    try {
+      resolvedRoot = document.querySelector(args.root);
+    } catch {
+      resolvedRoot = null;
+    }
+  }
+  const computePath = (element: Element) => {
+    const indices: string[] = [];
+    let current: Element | null = element;
+    let guard = 0;
+    let foundRoot = false;
+    while (current && guard < 80) {
+      if (current === resolvedRoot) {
+        foundRoot = true;
+        break;
+      }
+      const parent: Element | null = current.parentElement;
+      if (!parent) break;
+      const idx = Array.prototype.indexOf.call(parent.children || [], current);
+      indices.unshift(String(idx));
+      current = parent;
+      guard += 1;
+    }
+    return foundRoot ? ['root', ...indices].join('/') : null;
+  };
+  const describe = (element: Element, css: string) => {
+    const domPath = resolvedRoot ? computePath(element) : null;
+    return {
+      dom_path: domPath,
+      dom_root_selector: domPath ? args.root : null,
+      tag: element.tagName,
+      id: element.id || null,
+      classes: Array.from(element.classList || []),
+      textSnippet: (element.textContent || '').replace(/\s+/g, ' ').trim().slice(0, 120),
+      selector: css,
+    };
+  };
+  // 多个容器共用同一 selector 时（如 #app），单次调用内只查询一次
+  const queried = new Map<string, NodeListOf<Element> | null>();
+  const queryAll = (css: string) => {
+    if (queried.has(css)) return queried.get(css)!;
+    let els: NodeListOf<Element> | null;
+    try {
+      els = document.querySelectorAll(css);
+    } catch {
+      els = null;
+    }
+    queried.set(css, els);
+    return els;
+  };
+  const out: Record<string, CollectedMatch> = {};
+  for (const { cid, selectors } of args.payload) {
+    const matched: string[] = [];
+    const nodes: any[] = [];
+    let total = 0;
+    for (const css of selectors) {
+      const els = queryAll(css);
+      if (!els || !els.length) continue;
+      matched.push(css);
+      total += els.length;
+      const limit = Math.min(els.length, args.maxNodes);
+      for (let i = 0; i < limit; i++) {
+        nodes.push(describe(els[i], css));
+      }
+      if (nodes.length >= args.maxNodes) break;
+    }
+    out[cid] = { selectors: matched, match_count: total, nodes };
+  }
+  return out;
+}
+
+interface SelectorProbe {
+  count: number;
+  guardsOk: boolean;
+  error?: string;
+}
+
+/**
+ * 在页面内执行：统计 css 命中数，并在首个命中节点上校验 required/excluded descendants guards。
+ */
+function probeSelectorInPage(args: { css: string; req: string[]; excl: string[] }): SelectorProbe {
+  let els: NodeListOf<Element>;
+  try {
+    els = document.querySelectorAll(args.css);
+  } catch (err) {
+    return { count: 0, guardsOk: false, error: String((err as Error)?.message || err) };
+  }
+  if (!els.length) {
+    return { count: 0, guardsOk: false };
+  }
+  if (!args.req.length && !args.excl.length) {
+    return { count: els.length, guardsOk: true };
+  }
+  const host = els[0];
+  const has = (sel: string) => {
+    try {
+      return !!host.querySelector(sel);
+    } catch {
+      return false;
+    }
+  };
+  let guardsOk = true;
+  if (args.req.length && !args.req.some(has)) guardsOk = false;
+  if (guardsOk && args.excl.length && args.excl.some(has)) guardsOk = false;
+  return { count: els.length, guardsOk };
+}
+
+interface RootMatchSpec {
+  cid: string;
+  index: number;
+  css: string;
+  req: string[];
+  excl: string[];
+}
+
+/**
+ * 在页面内执行：按优先级依次检查根容器 selector（含 guards），返回首个命中的 spec 序号与命中数。
+ */
+function firstMatchInPage(specs: RootMatchSpec[]): { spec: number; count: number } | null {
+  // 相同 css 只查询一次：未命中（或非法）的 selector 后续直接跳过，命中的复用结果只重新校验 guards
+  const queried = new Map<string, NodeListOf<Element> | null>();
+  for (let i = 0; i < specs.length; i++) {
+    const spec = specs[i];
+    let els = queried.get(spec.css);
+    if (els === undefined) {
+      try {
+        els = document.querySelectorAll(spec.css);
+      } catch {
+        els = null;
+      }
+      queried.set(spec.css, els);
+    }
+    if (!els || !els.length) continue;
+    // 无 guards 的容器命中即返回，不再构造 guards 校验闭包
+    if (!spec.req.length && !spec.excl.length) return { spec: i, count: els.length };
+    const host = els[0];
+    const has = (sel: string) => {
+      try {
+        return !!host.querySelector(sel);
+      } catch {
+        return false;
+      }
+    };
+    if (spec.req.length && !spec.req.some(has)) continue;
+    if (spec.excl.length && spec.excl.some(has)) continue;
+    return { spec: i, count: els.length };
+  }
+  return null;
+}
+
+interface InspectorSnapshot {
+  matches: Record<string, CollectedMatch>;
+  dom: { runtime: boolean; node: any } | null;
+}
+
+/**
+ * 在页面内执行：先收集容器匹配，再以匹配到的 dom_path 作为 forcePaths 捕获 DOM 树，
+ * 优先使用 __camoRuntime.dom.getBranch，不可用时使用 outline。需在 __webautoInspector 安装后调用。
+ */
+function snapshotInPage(args: { collect: CollectMatchesArgs; outline: DomOutlineConfig }): InspectorSnapshot {
+  const inspector = (window as any).__webautoInspector;
+  const matches: Record<string, CollectedMatch> = inspector.collect(args.collect);
+  const forcePaths: string[] = [];
+  for (const cid of Object.keys(matches)) {
+    for (const node of matches[cid].nodes) {
+      if (node.dom_path) forcePaths.push(node.dom_path);
+    }
+  }
+  const runtime = (window as any).__camoRuntime;
+  if (runtime?.dom?.getBranch) {
+    try {
+      const branch = runtime.dom.getBranch('root', {
+        rootSelector: args.outline.selector || null,
+        maxDepth: args.outline.maxDepth,
+        maxChildren: args.outline.maxChildren,
+        forcePaths,
+      });
+      if (branch?.node) {
+        return { matches, dom: { runtime: true, node: branch.node } };
+      }
+    } catch {
+      // fall through to outline
+    }
+  }
+  let node: any = null;
+  try {
+    node = inspector.outline(args.outline);
+  } catch {
+    node = null;
+  }
+  return { matches, dom: node ? { runtime: false, node } : null };
+}
+
+// 页面侧 helper 以源码形式安装到 window.__webautoInspector，每个页面（导航后）只需传输/解析一次；
+// 之后每次调用只发送一个很小的分发函数。VERSION 变化时会重新安装。
+const INSPECTOR_VERSION = 6;
+const INSPECTOR_SOURCE = `(() => {
+  window.__webautoInspector = {
+    version: ${INSPECTOR_VERSION},
+    outline: ${outlineDomInPage.toString()},
+    collect: ${collectMatchesInPage.toString()},
+    probe: ${probeSelectorInPage.toString()},
+    first: ${firstMatchInPage.toString()},
+    snapshot: ${snapshotInPage.toString()},
+  };
+  return true;
+})()`;
+
+type InspectorMethod = 'outline' | 'collect' | 'probe' | 'first' | 'snapshot';
+
+// 根容器首轮未命中时，等待其出现的总时长（原先为 3 次 × 300ms 固定轮询）
+const ROOT_MATCH_WAIT_MS = 900;
+
 export class ContainerMatcher {
   constructor(private registry = new ContainerRegistry()) {}
 
   async matchRoot(
     session: AutomationSession,
     pageContext: { url: string },
+    options: { includeDefinition?: boolean } = {},
   ): Promise<ContainerMatchResult | null> {
     const url = pageContext?.url;
     if (!url) {
@@ -45,27 +445,88 @@ export class ContainerMatcher {
 
     const page = await session.ensurePage(url);
     await this.waitForStableDom(page);
+    const match = await this.matchRootOnPage(page, containers, url);
+    if (match && options.includeDefinition) {
+      // 完整容器定义仅在调用方明确需要时附带，默认不随匹配结果序列化
+      match.container.definition = containers[match.match_details.container_id] || null;
+    }
+    return match;
+  }
+
+  /**
+   * 在已就绪的页面上匹配根容器。首轮未命中时不再固定间隔轮询，
+   * 而是交给 waitForFunction 在页面内等待任一根容器（含 guards）满足后再匹配一次。
+   */
+  private async matchRootOnPage(
+    page: AutomationPage,
+    containers: Record<string, ContainerDefinition>,
+    url: string,
+    alreadyTried?: ReadonlySet<string>,
+  ): Promise<ContainerMatchResult | null> {
     const currentUrl = page.url() || url;
     const pagePath = this.safePathname(currentUrl);
 
-    const rootContainers = Object.entries(containers)
-      .filter(([containerId]) => !containerId.includes('.'))
-      .sort((a, b) => this.scoreContainer(b[1]) - this.scoreContainer(a[1]));
+    // 先按 page_patterns 过滤，URL 不匹配的根容器不再发起任何页面查询
+    const rootContainers = this.rootContainersOf(containers).filter((entry) =>
+      this.matchesPagePatterns(entry.container, currentUrl, pagePath),
+    );
+    if (!rootContainers.length) return null;
 
-    for (let attempt = 0; attempt < 3; attempt++) {
-      for (const [containerId, containerDef] of rootContainers) {
-        const match = await this.matchContainer(page, containerId, containerDef, currentUrl, pagePath);
-        if (match) {
-          return match;
-        }
-      }
+    // 所有根容器的 selector 按优先级展开成一个列表，每轮只需一次页面调用即可找到首个命中
+    const specs = rootContainers.flatMap((entry) => entry.specs);
+    if (!specs.length) return null;
+
+    // alreadyTried：调用方刚匹配失败的容器，首轮跳过；等待后的第二轮仍包含它们（可能只是尚未渲染）
+    const runPass = async (skip?: ReadonlySet<string>) => {
+      const pass = skip?.size ? specs.filter((spec) => !skip.has(spec.cid)) : specs;
+      if (!pass.length) return null;
+      let hit: { spec: number; count: number } | null = null;
       try {
-        await page.waitForTimeout(300);
-      } catch {
-        break;
+        hit = await this.callInspector<{ spec: number; count: number } | null>(page, 'first', pass);
+      } catch (err) {
+        console.warn('[container-matcher] root match failed', err);
+        return null;
       }
+      if (!hit) return null;
+      const spec = pass[hit.spec];
+      const containerDef = containers[spec.cid];
+      const selector = containerDef.selectors![spec.index];
+      return this.buildMatchPayload(spec.cid, containerDef, selector, spec.css, hit.count, currentUrl);
+    };
+
+    const first = await runPass(alreadyTried);
+    if (first) return first;
+
+    try {
+      await page.waitForFunction(
+        (list: RootMatchSpec[]) => {
+          const has = (root: ParentNode, sel: string) => {
+            try {
+              return !!root.querySelector(sel);
+            } catch {
+              return false;
+            }
+          };
+          return list.some((spec) => {
+            let el: Element | null = null;
+            try {
+              el = document.querySelector(spec.css);
+            } catch {
+              return false;
+            }
+            if (!el) return false;
+            if (spec.req.length && !spec.req.some((sel) => has(el!, sel))) return false;
+            if (spec.excl.length && spec.excl.some((sel) => has(el!, sel))) return false;
+            return true;
+          });
+        },
+        specs,
+        { timeout: ROOT_MATCH_WAIT_MS },
+      );
+    } catch {
+      return null;
     }
-    return null;
+    return runPass();
   }
 
   async inspectTree(
@@ -92,6 +553,7 @@ export class ContainerMatcher {
 
     const maxDepth = this.clampNumber(options.max_depth ?? options.maxDepth ?? 4, 1, 6);
     const maxChildren = this.clampNumber(options.max_children ?? options.maxChildren ?? 6, 1, 12);
+    const nodeBudget = this.resolveNodeBudget(options);
 
     const preferredRootId = options.root_container_id || options.root_id;
     const preferredSelector = options.root_selector;
@@ -107,7 +569,13 @@ export class ContainerMatcher {
       );
     }
     if (!rootMatch) {
-      rootMatch = await this.matchRoot(session, pageContext);
+      // 页面已在上面等待就绪，这里直接匹配，避免 matchRoot 再次等待 DOM
+      rootMatch = await this.matchRootOnPage(
+        page,
+        containers,
+        url,
+        preferredRootId && containers[preferredRootId] ? new Set([preferredRootId]) : undefined,
+      );
     }
     if (!rootMatch) {
       throw new Error('No DOM elements matched known containers');
@@ -115,29 +583,39 @@ export class ContainerMatcher {
     timings.push({ step: 'match_root', duration_ms: Date.now() - matchStart });
 
     const effectiveSelector = preferredSelector || rootMatch.container?.matched_selector;
-    const collectStart = Date.now();
+    const snapshotStart = Date.now();
     // 仅收集以根容器为起点的子树内的匹配结果，避免对当前页面无关的容器做全量扫描
     const subtreeIds = this.collectSubtreeIds(containers, rootMatch.container.id);
-    const matchMap = await this.collectContainerMatches(page, containers, effectiveSelector, undefined, subtreeIds);
-    timings.push({ step: 'collect_container_matches', duration_ms: Date.now() - collectStart });
+    const { entries, payload } = this.buildCollectPayload(containers, subtreeIds);
+    // 匹配收集与 DOM 捕获在页面内一次完成（DOM 捕获依赖匹配出的 dom_path 作为 forcePaths）
+    const snapshot = await this.callInspector<InspectorSnapshot>(page, 'snapshot', {
+      collect: { payload, root: effectiveSelector || null, maxNodes: 4 },
+      outline: { selector: effectiveSelector || null, path: null, maxDepth, maxChildren, nodeBudget },
+    }).catch((): InspectorSnapshot | null => null);
+    const matchMap = this.summarizeCollectedMatches(entries, snapshot?.matches || {});
+    timings.push({ step: 'inspector_snapshot', duration_ms: Date.now() - snapshotStart });
     const buildTreeStart = Date.now();
     const containerTree = this.buildContainerTree(containers, rootMatch.container.id, matchMap);
     timings.push({ step: 'build_container_tree', duration_ms: Date.now() - buildTreeStart });
-    const domCaptureStart = Date.now();
 
-    const matchedPaths: string[] = [];
-    if (matchMap) {
-      for (const result of Object.values(matchMap) as any[]) {
-        if (result.nodes && Array.isArray(result.nodes)) {
-          for (const node of result.nodes) {
-            if (node.dom_path) matchedPaths.push(node.dom_path);
-          }
-        }
-      }
+    let domTree = snapshot?.dom
+      ? snapshot.dom.runtime
+        ? this.normalizeRuntimeNode(snapshot.dom.node)
+        : snapshot.dom.node
+      : null;
+    if (!domTree) {
+      // 根节点尚未挂载等情况：回落到带等待的逐候选捕获
+      const domCaptureStart = Date.now();
+      domTree = await this.captureDomTreeWithRetry(
+        page,
+        effectiveSelector,
+        maxDepth,
+        maxChildren,
+        this.collectMatchedPaths(matchMap),
+        nodeBudget,
+      );
+      timings.push({ step: 'capture_dom_tree', duration_ms: Date.now() - domCaptureStart });
     }
-
-    const domTree = await this.captureDomTreeWithRetry(page, effectiveSelector, maxDepth, maxChildren, matchedPaths);
-    timings.push({ step: 'capture_dom_tree', duration_ms: Date.now() - domCaptureStart });
     const annotateStart = Date.now();
     const annotations = this.buildDomAnnotations(matchMap);
     this.attachDomAnnotations(domTree, annotations);
@@ -179,6 +657,7 @@ export class ContainerMatcher {
     await this.waitForStableDom(page);
     const maxDepth = this.clampNumber(options.max_depth ?? options.maxDepth ?? 4, 1, 6);
     const maxChildren = this.clampNumber(options.max_children ?? options.maxChildren ?? 6, 1, 20);
+    const nodeBudget = this.resolveNodeBudget(options);
     const containers = this.registry.getContainersForUrl(url);
     const preferredRootId = options.root_container_id || options.root_id;
     const rootSelector =
@@ -187,11 +666,11 @@ export class ContainerMatcher {
     if (!rootSelector) {
       throw new Error('无法确定根容器选择器');
     }
-    const branch = await this.captureDomBranch(page, rootSelector, path, maxDepth, maxChildren);
+    const branch = await this.captureDomBranch(page, rootSelector, path, maxDepth, maxChildren, nodeBudget);
     if (!branch) {
       throw new Error('无法捕获 DOM 分支');
     }
-    let annotations: Record<string, any[]> = {};
+    let annotations = new Map<string, DomAnnotation[]>();
     if (containers && Object.keys(containers).length) {
       const matchSummary = await this.collectContainerMatches(page, containers, rootSelector, 8);
       annotations = this.buildDomAnnotations(matchSummary);
@@ -213,6 +692,7 @@ export class ContainerMatcher {
     try {
       await page.waitForLoadState('domcontentloaded', { timeout: 20000 });
       await page.waitForLoadState('networkidle', { timeout: 5000 }).catch(() => {});
+      // 第二个参数是页面函数的入参，超时需放在第三个参数中才会生效
       await page.waitForFunction(
         () => {
           const app = document.querySelector('#app');
@@ -221,6 +701,7 @@ export class ContainerMatcher {
           }
           return document.body?.children?.length > 2;
         },
+        undefined,
         { timeout: 12000 },
       ).catch(() => {});
     } catch {}
@@ -241,54 +722,95 @@ export class ContainerMatcher {
       console.warn('[container-matcher] container has no selectors', containerId);
       return null;
     }
+    const guards = this.resolveGuards(container.metadata);
     for (const selector of selectors) {
       const css = this.selectorToCss(selector);
       if (!css) continue;
-      let handles = [];
+      // 计数与 guards 校验在页面内一次完成，不再为每个命中节点创建/释放 ElementHandle
+      let probe: SelectorProbe;
       try {
-        handles = await page.$$(css);
+        probe = await this.callInspector<SelectorProbe>(page, 'probe', { css, ...guards });
       } catch (err) {
         console.warn('[container-matcher] selector failed', css, err);
         continue;
       }
-      const count = handles.length;
+      if (!probe || probe.error) {
+        console.warn('[container-matcher] selector failed', css, probe?.error);
+        continue;
+      }
+      const count = probe.count;
       if (!count) {
-        console.warn('[container-matcher] selector matched 0 nodes', css);
+        // 未命中是匹配中的常态，只在 DEBUG 下记录，避免逐个 selector 刷屏
+        logDebug('container-matcher', 'selector_miss', { containerId, css });
         continue;
       }
-
-      const guards = container.metadata || {};
-      if (!(await this.evaluateGuards(handles[0], guards))) {
-        await Promise.all(handles.map((h) => h.dispose().catch(() => {})));
+      if (!probe.guardsOk) {
         continue;
       }
 
-      const payload = {
-        container: {
-          id: container.id || containerId,
-          name: container.name,
-          type: container.type,
-          matched_selector: css,
-          match_count: count,
-          definition: container,
-        },
-        match_details: {
-          container_id: containerId,
-          selector_variant: selector.variant || 'primary',
-          selector_classes: selector.classes || [],
-          matched_selector: css,
-          page_url: url,
-          match_count: count,
-        },
-      };
-
-      await Promise.all(handles.map((h) => h.dispose().catch(() => {})));
-      return payload;
+      return this.buildMatchPayload(containerId, container, selector, css, count, url);
     }
     return null;
   }
 
+  private buildMatchPayload(
+    containerId: string,
+    container: ContainerDefinition,
+    selector: SelectorDefinition,
+    css: string,
+    count: number,
+    url: string,
+  ): ContainerMatchResult {
+    return {
+      container: {
+        id: container.id || containerId,
+        name: container.name,
+        type: container.type,
+        matched_selector: css,
+        match_count: count,
+        selector_count: (container.selectors || []).length,
+      },
+      match_details: {
+        container_id: containerId,
+        selector_variant: selector.variant || 'primary',
+        selector_classes: selector.classes || [],
+        matched_selector: css,
+        page_url: url,
+        match_count: count,
+      },
+    };
+  }
+
+  private rootContainersOf(containers: Record<string, ContainerDefinition>) {
+    let roots = rootContainerIndex.get(containers);
+    if (!roots) {
+      roots = Object.entries(containers)
+        .filter(([containerId]) => !containerId.includes('.'))
+        .sort((a, b) => this.scoreContainer(b[1]) - this.scoreContainer(a[1]))
+        .map(([containerId, container]) => {
+          const guards = this.resolveGuards(container.metadata);
+          const specs: RootMatchSpec[] = [];
+          (container.selectors || []).forEach((selector, index) => {
+            const css = this.selectorToCss(selector);
+            if (css) specs.push({ cid: containerId, index, css, ...guards });
+          });
+          return { id: containerId, container, specs };
+        });
+      rootContainerIndex.set(containers, roots);
+    }
+    return roots;
+  }
+
   private scoreContainer(container: ContainerDefinition) {
+    // 评分只依赖容器定义本身；registry 缓存期内定义对象被复用，按对象记忆
+    const cached = containerScores.get(container);
+    if (cached !== undefined) return cached;
+    const score = this.computeContainerScore(container);
+    containerScores.set(container, score);
+    return score;
+  }
+
+  private computeContainerScore(container: ContainerDefinition) {
     const meta = container.metadata || {};
     const req = Array.isArray(meta.required_descendants_any) ? meta.required_descendants_any.length : 0;
     const excl = Array.isArray(meta.excluded_descendants_any) ? meta.excluded_descendants_any.length : 0;
@@ -300,118 +822,49 @@ export class ContainerMatcher {
     return req * 2 + excl + (specificSelector ? 1 : 0);
   }
 
-  private selectorToCss(selector: SelectorDefinition) {
+  private selectorToCss(selector: SelectorDefinition): string | null {
     if (selector.css) {
       return selector.css;
     }
-    if (selector.id) {
-      return `#${selector.id}`;
+    const cached = selectorCssCache.get(selector);
+    if (cached !== undefined) {
+      return cached;
     }
-    if (selector.classes && selector.classes.length) {
-      return selector.classes.map((cls) => `.${cls}`).join('');
+    let css: string | null = null;
+    if (selector.id) {
+      css = `#${selector.id}`;
+    } else if (selector.classes && selector.classes.length) {
+      css = selector.classes.map((cls) => `.${cls}`).join('');
     }
-    return null;
+    selectorCssCache.set(selector, css);
+    return css;
   }
 
   private matchesPagePatterns(container: ContainerDefinition, pageUrl: string, pagePath: string) {
-    const host = this.safeHostname(pageUrl);
     const patterns = container.page_patterns || container.pagePatterns;
     if (!patterns || !patterns.length) {
       return true;
     }
-    const includes: string[] = [];
-    const excludes: string[] = [];
-    for (const pattern of patterns) {
-      if (typeof pattern !== 'string') continue;
-      if (pattern.startsWith('!')) {
-        excludes.push(pattern.slice(1));
-      } else {
-        includes.push(pattern);
-      }
-    }
-    for (const pattern of excludes) {
-      if (this.valueMatchesPattern(pageUrl, pattern) ||
-        this.valueMatchesPattern(pagePath, pattern) ||
-        this.valueMatchesPattern(host, pattern)) {
-        return false;
-      }
-    }
-    if (!includes.length) {
-      return true;
-    }
-    for (const pattern of includes) {
-      if (this.valueMatchesPattern(pageUrl, pattern) ||
-        this.valueMatchesPattern(pagePath, pattern) ||
-        this.valueMatchesPattern(host, pattern)) {
-        return true;
-      }
-    }
-    return false;
-  }
-
-  private patternMatch(value: string, pattern: string) {
-    if (!pattern) return false;
-    const escaped = pattern.replace(/[.+^${}()|[\]\\]/g, '\\$&').replace(/\*/g, '.*');
-    const regex = new RegExp(`^${escaped}$`);
-    return regex.test(value);
-  }
-
-  private valueMatchesPattern(value: string, pattern: string) {
-    if (this.patternMatch(value, pattern)) {
-      return true;
+    const { include, exclude } = compilePagePatterns(patterns);
+    const host = this.safeHostname(pageUrl);
+    if (exclude && (exclude.test(pageUrl) || exclude.test(pagePath) || exclude.test(host))) {
+      return false;
     }
-    if (!pattern.includes('*') && value.includes(pattern)) {
+    if (!include) {
       return true;
     }
-    return false;
+    return include.test(pageUrl) || include.test(pagePath) || include.test(host);
   }
 
-  private async evaluateGuards(handle: AutomationElementHandle, metadata: Record<string, any>) {
-    const req: string[] = Array.isArray(metadata?.required_descendants_any)
-      ? metadata.required_descendants_any
-      : [];
-    const excl: string[] = Array.isArray(metadata?.excluded_descendants_any)
-      ? metadata.excluded_descendants_any
-      : [];
-
-    if (!req.length && !excl.length) {
-      return true;
-    }
-    try {
-      return await handle.evaluate((element, guards) => {
-        const { reqSelectors, exclSelectors } = guards;
-        if (Array.isArray(reqSelectors) && reqSelectors.length) {
-          const hasRequired = reqSelectors.some((sel) => {
-            try {
-              return !!element.querySelector(sel);
-            } catch {
-              return false;
-            }
-          });
-          if (!hasRequired) {
-            return false;
-          }
-        }
-        if (Array.isArray(exclSelectors) && exclSelectors.length) {
-          const hasExcluded = exclSelectors.some((sel) => {
-            try {
-              return !!element.querySelector(sel);
-            } catch {
-              return false;
-            }
-          });
-          if (hasExcluded) {
-            return false;
-          }
-        }
-        return true;
-      }, {
-        reqSelectors: req,
-        exclSelectors: excl,
-      });
-    } catch {
-      return false;
-    }
+  private resolveGuards(metadata?: Record<string, any>): ContainerGuards {
+    if (!metadata || typeof metadata !== 'object') return NO_GUARDS;
+    const cached = containerGuards.get(metadata);
+    if (cached) return cached;
+    const req = Array.isArray(metadata.required_descendants_any) ? (metadata.required_descendants_any as string[]) : [];
+    const excl = Array.isArray(metadata.excluded_descendants_any) ? (metadata.excluded_descendants_any as string[]) : [];
+    const guards = req.length || excl.length ? { req, excl } : NO_GUARDS;
+    containerGuards.set(metadata, guards);
+    return guards;
   }
 
   private clampNumber(value: number, min: number, max: number) {
@@ -426,57 +879,71 @@ export class ContainerMatcher {
     maxNodes = 4,
     onlyContainerIds?: Set<string>,
   ) {
-    const summary: Record<string, any> = {};
-    for (const [containerId, container] of Object.entries(containers)) {
-      if (onlyContainerIds && !onlyContainerIds.has(containerId)) {
-        continue;
-      }
-      const selectors: string[] = [];
-      const nodes: Record<string, any>[] = [];
-      let matchCount = 0;
-      for (const selector of container.selectors || []) {
-        const css = this.selectorToCss(selector);
-        if (!css) continue;
-        let handles: AutomationElementHandle[] = [];
-        try {
-          handles = await page.$$(css);
-        } catch {
-          continue;
-        }
-        const count = handles.length;
-        if (!count) {
-          await Promise.all(handles.map((h) => h.dispose().catch(() => {})));
-          continue;
-        }
-        selectors.push(css);
-        matchCount += count;
-        for (const handle of handles.slice(0, maxNodes)) {
-          const info: any = await this.describeElement(handle, rootSelector);
-          if (info) {
-            info.selector = css;
-            nodes.push(info);
-          }
-        }
-        await Promise.all(handles.map((h) => h.dispose().catch(() => {})));
-        if (nodes.length >= maxNodes) {
-          break;
-        }
+    const { entries, payload } = this.buildCollectPayload(containers, onlyContainerIds);
+
+    // 所有容器的 selector 查询与节点描述在一次 page.evaluate 中完成，避免逐个 $$ / handle.evaluate 往返
+    let results: Record<string, CollectedMatch> = {};
+    if (payload.length) {
+      try {
+        results =
+          (await this.callInspector<Record<string, CollectedMatch>>(page, 'collect', {
+            payload,
+            root: rootSelector || null,
+            maxNodes,
+          })) || {};
+      } catch {
+        results = {};
       }
+    }
+    return this.summarizeCollectedMatches(entries, results);
+  }
+
+  private buildCollectPayload(containers: Record<string, ContainerDefinition>, onlyContainerIds?: Set<string>) {
+    const entries = Object.entries(containers).filter(
+      ([containerId]) => !onlyContainerIds || onlyContainerIds.has(containerId),
+    );
+    const payload = entries.map(([containerId, container]) => ({
+      cid: containerId,
+      selectors: (container.selectors || [])
+        .map((selector) => this.selectorToCss(selector))
+        .filter((css): css is string => Boolean(css)),
+    }));
+    return { entries, payload };
+  }
 
+  private summarizeCollectedMatches(
+    entries: Array<[string, ContainerDefinition]>,
+    results: Record<string, CollectedMatch>,
+  ) {
+    const summary: Record<string, any> = {};
+    for (const [containerId, container] of entries) {
+      const result = results[containerId];
       summary[containerId] = {
         container: {
           id: container.id || containerId,
           name: container.name,
           type: container.type,
         },
-        selectors,
-        match_count: matchCount,
-        nodes,
+        selectors: result?.selectors || [],
+        match_count: result?.match_count || 0,
+        nodes: result?.nodes || [],
       };
     }
     return summary;
   }
 
+  private collectMatchedPaths(matchMap: Record<string, any>) {
+    const matchedPaths: string[] = [];
+    for (const result of Object.values(matchMap) as any[]) {
+      if (result.nodes && Array.isArray(result.nodes)) {
+        for (const node of result.nodes) {
+          if (node.dom_path) matchedPaths.push(node.dom_path);
+        }
+      }
+    }
+    return matchedPaths;
+  }
+
   private collectSubtreeIds(
     containers: Record<string, ContainerDefinition>,
     rootId: string,
@@ -548,16 +1015,29 @@ export class ContainerMatcher {
     if (explicit.length) {
       return explicit;
     }
-    const prefix = `${containerId}.`;
-    const targetDepth = containerId.split('.').length;
-    const fallback: string[] = [];
-    for (const key of Object.keys(containers)) {
-      if (!key.startsWith(prefix)) continue;
-      if (key.split('.').length === targetDepth + 1) {
-        fallback.push(key);
+    return this.implicitChildrenOf(containers).get(containerId) || [];
+  }
+
+  /**
+   * 未声明 children 时按 id 层级推断子容器（a.b 是 a 的子容器）。按容器表一次性建立 父 id -> 子 id 索引，
+   * 构建容器树时不再为每个节点扫描并切分全部 id。
+   */
+  private implicitChildrenOf(containers: Record<string, ContainerDefinition>) {
+    let index = implicitChildIndex.get(containers);
+    if (!index) {
+      index = new Map<string, string[]>();
+      for (const key of Object.keys(containers)) {
+        const dot = key.lastIndexOf('.');
+        if (dot <= 0) continue;
+        const parentId = key.slice(0, dot);
+        const siblings = index.get(parentId);
+        if (siblings) siblings.push(key);
+        else index.set(parentId, [key]);
       }
+      for (const siblings of index.values()) siblings.sort();
+      implicitChildIndex.set(containers, index);
     }
-    return fallback.sort();
+    return index;
   }
 
   private inferFallbackRoot(containers: Record<string, ContainerDefinition>, preferredId?: string) {
@@ -585,25 +1065,45 @@ export class ContainerMatcher {
     maxDepth: number,
     maxChildren: number,
     forcePaths?: string[],
+    nodeBudget = DEFAULT_NODE_BUDGET,
   ) {
     const attempts: Array<string | null> = [];
     if (selector) attempts.push(selector);
     attempts.push('#app', 'body', null);
     const tried = new Set<string>();
+    const capture = (candidate: string | null) =>
+      this.captureDomTree(page, candidate || undefined, maxDepth, maxChildren, forcePaths, nodeBudget);
     for (const candidate of attempts) {
       const key = candidate ?? '__root__';
       if (tried.has(key)) continue;
       tried.add(key);
-      const retries = candidate && candidate === selector ? 5 : 3;
-      for (let i = 0; i < retries; i++) {
-        const outline = await this.captureDomTree(page, candidate || undefined, maxDepth, maxChildren, forcePaths);
-        if (outline) {
-          return outline;
-        }
-        await page.waitForTimeout(250).catch(() => {});
+      const outline = await capture(candidate);
+      if (outline) {
+        return outline;
+      }
+      if (!candidate) continue;
+      // 首次失败说明节点尚未挂载：等待其出现（页面内事件驱动）后只再捕获一次，不再固定间隔轮询
+      const attached = await page
+        .waitForFunction(
+          (css: string) => {
+            try {
+              return !!document.querySelector(css);
+            } catch {
+              return false;
+            }
+          },
+          candidate,
+          { timeout: DOM_ATTACH_WAIT_MS },
+        )
+        .then(() => true)
+        .catch(() => false);
+      if (!attached) continue;
+      const retried = await capture(candidate);
+      if (retried) {
+        return retried;
       }
     }
-    return this.captureFallbackDomTree(page, maxDepth, maxChildren);
+    return this.captureFallbackDomTree(page, maxDepth, maxChildren, nodeBudget);
   }
 
   private async captureDomTree(
@@ -612,6 +1112,7 @@ export class ContainerMatcher {
     maxDepth: number,
     maxChildren: number,
     forcePaths?: string[],
+    nodeBudget = DEFAULT_NODE_BUDGET,
   ) {
     const runtimeTree = await page
       .evaluate(
@@ -636,7 +1137,7 @@ export class ContainerMatcher {
         return normalized;
       }
     }
-    return this.captureDomTreeLegacy(page, selector, maxDepth, maxChildren);
+    return this.captureDomTreeLegacy(page, selector, maxDepth, maxChildren, nodeBudget);
   }
 
   private async captureDomTreeLegacy(
@@ -644,106 +1145,81 @@ export class ContainerMatcher {
     selector: string | undefined,
     maxDepth: number,
     maxChildren: number,
+    nodeBudget = DEFAULT_NODE_BUDGET,
   ) {
     try {
-      return await page.evaluate(
-        (config) => {
-          const target = config.selector ? document.querySelector(config.selector) : document.body;
-          if (!target) return null;
-          const walk = (element: Element, path: string[], depth: number): any => {
-            const meta = {
-              path: path.join('/'),
-              tag: element.tagName,
-              id: element.id || null,
-              classes: Array.from(element.classList || []),
-              childCount: element.children?.length || 0,
-              textSnippet: (element.textContent || '').trim().slice(0, 80),
-              children: [] as any[],
-            };
-            if (depth >= config.maxDepth) {
-              return meta;
-            }
-            const children = Array.from(element.children || []).slice(0, config.maxChildren);
-            meta.children = children.map((child, idx) =>
-              walk(child, path.concat(String(idx)), depth + 1),
-            );
-            return meta;
-          };
-          return walk(target, ['root'], 0);
-        },
-        {
-          selector,
-          maxDepth,
-          maxChildren,
-        },
-      );
+      return await this.callInspector(page, 'outline', {
+        selector: selector || null,
+        path: null,
+        maxDepth,
+        maxChildren,
+        nodeBudget,
+      });
     } catch {
       return null;
     }
   }
 
-  private async captureFallbackDomTree(page: AutomationPage, maxDepth: number, maxChildren: number) {
+  private async captureFallbackDomTree(
+    page: AutomationPage,
+    maxDepth: number,
+    maxChildren: number,
+    nodeBudget = DEFAULT_NODE_BUDGET,
+  ) {
     try {
-      return await page.evaluate(
-        (config) => {
-          const root = document.body || (document.documentElement as any);
-          if (!root) return null;
-          const walk = (element: any, path: string[], depth: number): any => {
-            const meta = {
-              path: path.join('/'),
-              tag: element.tagName,
-              id: element.id || null,
-              classes: Array.from(element.classList || []),
-              childCount: element.children?.length || 0,
-              textSnippet: (element.textContent || '').trim().slice(0, 80),
-              children: [] as any[],
-            };
-            if (depth >= config.maxDepth) {
-              return meta;
-            }
-            const kids = Array.from(element.children || []).slice(0, config.maxChildren);
-            meta.children = kids.map((child, idx) => walk(child, path.concat(String(idx)), depth + 1));
-            return meta;
-          };
-          return walk(root, ['root'], 0);
-        },
-        {
-          maxDepth: Math.max(1, Math.min(Number(maxDepth) || 4, 8)),
-          maxChildren: Math.max(1, Math.min(Number(maxChildren) || 8, 40)),
-        },
-      );
+      return await this.callInspector(page, 'outline', {
+        selector: null,
+        path: null,
+        fallbackRoot: true,
+        maxDepth: Math.max(1, Math.min(Number(maxDepth) || 4, 8)),
+        maxChildren: Math.max(1, Math.min(Number(maxChildren) || 8, 40)),
+        nodeBudget,
+      });
     } catch {
       return null;
     }
   }
 
   private buildDomAnnotations(matchMap: Record<string, any>) {
-    const annotations: Record<string, Array<{ container_id: string; container_name?: string; selector?: string }>> = {};
+    const annotations = new Map<string, DomAnnotation[]>();
     for (const [containerId, payload] of Object.entries(matchMap)) {
       const nodes = payload.nodes || [];
+      if (!nodes.length) continue;
+      const containerName = payload.container?.name || payload.container?.id;
       for (const node of nodes) {
         const path = node.dom_path;
         if (!path) continue;
-        annotations[path] = annotations[path] || [];
-        annotations[path].push({
-          container_id: containerId,
-          container_name: payload.container?.name || payload.container?.id,
-          selector: node.selector,
-        });
+        const entry = { container_id: containerId, container_name: containerName, selector: node.selector };
+        const list = annotations.get(path);
+        if (list) {
+          list.push(entry);
+        } else {
+          annotations.set(path, [entry]);
+        }
       }
     }
     return annotations;
   }
 
-  private attachDomAnnotations(domTree: any, annotations: Record<string, any[]>) {
+  private attachDomAnnotations(domTree: any, annotations: Map<string, DomAnnotation[]>) {
     if (!domTree) return;
-    const visit = (node: any) => {
-      node.containers = annotations[node.path] || [];
-      for (const child of node.children || []) {
-        visit(child);
+    // 迭代遍历；只有命中容器的节点才带 containers 字段，未命中节点不再附加空数组
+    const stack: any[] = [domTree];
+    while (stack.length) {
+      const node = stack.pop();
+      const hits = annotations.get(node.path);
+      if (hits && hits.length) {
+        node.containers = hits;
+      } else if (node.containers !== undefined) {
+        delete node.containers;
       }
-    };
-    visit(domTree);
+      const children = node.children;
+      if (children && children.length) {
+        for (let i = children.length - 1; i >= 0; i--) {
+          stack.push(children[i]);
+        }
+      }
+    }
   }
 
   private async captureDomBranch(
@@ -752,6 +1228,7 @@ export class ContainerMatcher {
     path: string,
     maxDepth: number,
     maxChildren: number,
+    nodeBudget = DEFAULT_NODE_BUDGET,
   ) {
     const runtimeBranch = await page
       .evaluate(
@@ -772,7 +1249,7 @@ export class ContainerMatcher {
     if (runtimeBranch?.node) {
       return this.normalizeRuntimeNode(runtimeBranch.node);
     }
-    return this.captureDomBranchLegacy(page, selector, path, maxDepth, maxChildren);
+    return this.captureDomBranchLegacy(page, selector, path, maxDepth, maxChildren, nodeBudget);
   }
 
   private async captureDomBranchLegacy(
@@ -781,138 +1258,49 @@ export class ContainerMatcher {
     path: string,
     maxDepth: number,
     maxChildren: number,
+    nodeBudget = DEFAULT_NODE_BUDGET,
   ) {
     try {
-      return await page.evaluate(
-        (config) => {
-          const normalizePath = (raw: string) => {
-            if (!raw) return ['root'];
-            const tokens = raw.split('/').filter((token) => token.length);
-            if (!tokens.length || tokens[0] === '__root__') {
-              tokens[0] = 'root';
-            }
-            if (tokens[0] !== 'root') {
-              tokens.unshift('root');
-            }
-            return tokens;
-          };
-          const pathParts = normalizePath(config.path);
-          const root = document.querySelector(config.selector);
-          if (!root) return null;
-          const resolvePath = (node: Element | null, parts: string[], index: number): Element | null => {
-            if (!node) return null;
-            if (index >= parts.length) return node;
-            const targetIdx = Number(parts[index]);
-            const childNodes = Array.from(node.children ?? []);
-            if (!Number.isFinite(targetIdx) || targetIdx < 0 || targetIdx >= childNodes.length) {
-              return null;
-            }
-            return resolvePath(childNodes[targetIdx] as Element, parts, index + 1);
-          };
-          const startNode = resolvePath(root, pathParts, 1);
-          if (!startNode) return null;
-          const walk = (element: Element, pathTokens: string[], depth: number): any => {
-            const meta = {
-              path: pathTokens.join('/'),
-              tag: element.tagName,
-              id: element.id || null,
-              classes: Array.from(element.classList || []),
-              childCount: element.children?.length || 0,
-              textSnippet: (element.textContent || '').trim().slice(0, 80),
-              children: [] as any[],
-            };
-            if (depth >= config.maxDepth) {
-              return meta;
-            }
-            const children = Array.from(element.children || []).slice(0, config.maxChildren);
-            meta.children = children.map((child, idx) =>
-              walk(child, pathTokens.concat(String(idx)), depth + 1),
-            );
-            return meta;
-          };
-          return walk(startNode, pathParts, 0);
-        },
-        {
-          selector,
-          path,
-          maxDepth,
-          maxChildren,
-        },
-      );
+      return await this.callInspector(page, 'outline', {
+        selector,
+        path,
+        maxDepth,
+        maxChildren,
+        nodeBudget,
+      });
     } catch {
       return null;
     }
   }
 
-  private async describeElement(handle: AutomationElementHandle, rootSelector?: string) {
-    try {
-      return await handle.evaluate(
-        (element, selector) => {
-          const resolvedRoot = selector ? document.querySelector(selector) : null;
-          const computePath = (root: Element | null) => {
-            const indices: string[] = [];
-            let current: Element | null = element;
-            let guard = 0;
-            let foundRoot = false;
-            while (current && guard < 80) {
-              if (root && current === root) {
-                foundRoot = true;
-                break;
-              }
-              const parent = current.parentElement;
-              if (!parent) break;
-              const idx = Array.prototype.indexOf.call(parent.children || [], current);
-              indices.unshift(String(idx));
-              current = parent;
-              guard += 1;
-            }
-            return {
-              path: ['root', ...indices].join('/'),
-              foundRoot,
-            };
-          };
-
-          const rootPathInfo = resolvedRoot ? computePath(resolvedRoot) : null;
-          const useRoot = Boolean(rootPathInfo?.foundRoot);
-          const domPath = useRoot ? rootPathInfo?.path : null;
-          const classes = Array.from(element.classList || []);
-          const snippet = (element.textContent || '').replace(/\s+/g, ' ').trim().slice(0, 120);
-          return {
-            dom_path: domPath,
-            dom_root_selector: useRoot ? selector : null,
-            tag: element.tagName,
-            id: element.id || null,
-            classes,
-            textSnippet: snippet,
-          };
-        },
-        rootSelector || null,
-      );
-    } catch {
-      return null;
-    } finally {
-      try {
-        await handle.dispose();
-      } catch {
-        // ignore
+  private async callInspector<T = any>(page: AutomationPage, method: InspectorMethod, args: any): Promise<T> {
+    const invoke = (request: { method: InspectorMethod; args: any; version: number }) => {
+      const inspector = (window as any).__webautoInspector;
+      if (!inspector || inspector.version !== request.version) {
+        return { missing: true, value: null };
       }
+      return { missing: false, value: inspector[request.method](request.args) };
+    };
+    const request = { method, args, version: INSPECTOR_VERSION };
+    let response = await page.evaluate(invoke, request);
+    if (response?.missing) {
+      await page.evaluate(INSPECTOR_SOURCE);
+      response = await page.evaluate(invoke, request);
     }
+    return response?.value as T;
+  }
+
+  private resolveNodeBudget(options: Record<string, any>) {
+    const raw = Number(options.node_budget ?? options.nodeBudget ?? DEFAULT_NODE_BUDGET);
+    return this.clampNumber(Number.isFinite(raw) ? raw : DEFAULT_NODE_BUDGET, 1, MAX_NODE_BUDGET);
   }
 
   private safePathname(raw: string) {
-    try {
-      return new URL(raw).pathname || '/';
-    } catch {
-      return raw;
-    }
+    return parsePageUrl(raw).path;
   }
 
   private safeHostname(raw: string) {
-    try {
-      return new URL(raw).hostname || '';
-    } catch {
-      return '';
-    }
+    return parsePageUrl(raw).host;
   }
 
   private normalizeDomPath(path?: string | null) {
@@ -944,7 +1332,6 @@ export class ContainerMatcher {
             : 0,
       textSnippet: node.textSnippet || node.text || '',
       selector: node.selector || null,
-      containers: Array.isArray(node.containers) ? [...node.containers] : [],
       children: [],
     };
     if (Array.isArray(node.children)) {
@@ -970,8 +1357,9 @@ export class ContainerMatcher {
       const match = await this.matchRoot(session, pageContext);
       return match?.container?.matched_selector || null;
     }
+    const page = await session.ensurePage(pageContext.url);
+    const tried = new Set<string>();
     if (preferredId && containers[preferredId]) {
-      const page = await session.ensurePage(pageContext.url);
       const match = await this.matchContainer(
         page,
         preferredId,
@@ -982,8 +1370,10 @@ export class ContainerMatcher {
       if (match?.container?.matched_selector) {
         return match.container.matched_selector;
       }
+      tried.add(preferredId);
     }
-    const rootMatch = await this.matchRoot(session, pageContext);
+    // 调用方（inspectDomBranch）已等待 DOM 就绪，这里直接在页面上匹配
+    const rootMatch = await this.matchRootOnPage(page, containers, pageContext.url, tried);
     return rootMatch?.container?.matched_selector || null;
   }
 }
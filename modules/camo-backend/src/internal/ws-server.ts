@@ -4,7 +4,7 @@ import os from 'os';
 import { WebSocketServer, WebSocket } from 'ws';
 import type { RawData } from 'ws';
 import { SessionManager, SESSION_CLOSED_EVENT } from './SessionManager.js';
-import { ContainerMatcher } from './container-matcher.js';
+import { ContainerMatcher, type AutomationSession, type ContainerMatchResult } from './container-matcher.js';
 import { ensurePageRuntime } from './pageRuntime.js';
 import { logDebug } from '../../../../modules/logging/src/index.js';
 
@@ -23,15 +23,50 @@ const logsDir = path.join(os.homedir(), '.camo', 'logs');
 const domPickerLogPath = path.join(logsDir, 'dom-picker-debug.log');
 const highlightLogPath = path.join(logsDir, 'highlight-debug.log');
 
+// 调试日志按文件缓冲，同一 tick 内的多条记录合并为一次异步 append，避免每条日志一次同步写
+const pendingLogLines = new Map<string, string[]>();
+const readyLogDirs = new Set<string>();
+let logFlushScheduled = false;
+let logFlushChain: Promise<void> = Promise.resolve();
+
+async function flushPendingLogs() {
+  logFlushScheduled = false;
+  const batches = Array.from(pendingLogLines.entries());
+  pendingLogLines.clear();
+  for (const [target, lines] of batches) {
+    try {
+      const dir = path.dirname(target);
+      if (!readyLogDirs.has(dir)) {
+        await fs.promises.mkdir(dir, { recursive: true });
+        readyLogDirs.add(dir);
+      }
+      await fs.promises.appendFile(target, lines.join(''), 'utf-8');
+    } catch {
+      /* ignore log errors */
+    }
+  }
+}
+
 function appendLog(target: string, event: string, payload: Record<string, any> = {}) {
   try {
-    fs.mkdirSync(path.dirname(target), { recursive: true });
     const line = JSON.stringify({
       ts: new Date().toISOString(),
       event,
       ...payload,
     });
-    fs.appendFileSync(target, `${line}\n`, 'utf-8');
+    const lines = pendingLogLines.get(target);
+    if (lines) {
+      lines.push(`${line}\n`);
+    } else {
+      pendingLogLines.set(target, [`${line}\n`]);
+    }
+    if (!logFlushScheduled) {
+      logFlushScheduled = true;
+      // 串行化 flush，保证同一文件内日志顺序
+      setImmediate(() => {
+        logFlushChain = logFlushChain.then(flushPendingLogs);
+      });
+    }
   } catch {
     /* ignore log errors */
   }
@@ -61,6 +96,8 @@ export class BrowserWsServer {
   private sessionSubscribers = new Map<string, Set<WebSocket>>();
   private socketSessionTopics = new Map<WebSocket, Map<string, Set<string>>>();
   private runtimeBridgeUnsub = new Map<string, () => void>();
+  // 同一会话、同一 URL 的 match_root 在执行中时，重复请求复用同一个结果，不再重复等待与匹配
+  private inflightRootMatches = new Map<string, Promise<ContainerMatchResult | null>>();
 
   constructor(private options: WsServerOptions) {
     process.on(SESSION_CLOSED_EVENT, (sessionId: string) => {
@@ -591,11 +628,14 @@ export class BrowserWsServer {
     };
     logDebug('browser-service', 'runtimeEvent:broadcast', { topic, sessionId, listeners: clients.size });
 
+    // 同一事件对所有订阅者只序列化一次，复用同一份字符串发送
+    let serialized: string | null = null;
     clients.forEach((socket) => {
       const clientTopics = this.subscriptions.get(socket);
       if (clientTopics?.has(topic)) {
         try {
-          socket.send(JSON.stringify(payload));
+          if (serialized === null) serialized = JSON.stringify(payload);
+          socket.send(serialized);
         } catch (err) {
           console.warn('[browser-ws] failed to broadcast event:', err);
         }
@@ -848,11 +888,16 @@ export class BrowserWsServer {
        coords = { x: result.x + offset.x, y: result.y + offset.y };
      }
    } else if (selector) {
+     // 保留 page.$：支持 Playwright 选择器语法（text= / xpath= / >> 链）；取完坐标即释放 ElementHandle
      const element = await page.$(selector);
      if (element) {
-       const box = await element.boundingBox();
-       if (box) {
-         coords = { x: box.x + box.width / 2 + offset.x, y: box.y + box.height / 2 + offset.y };
+       try {
+         const box = await element.boundingBox();
+         if (box) {
+           coords = { x: box.x + box.width / 2 + offset.x, y: box.y + box.height / 2 + offset.y };
+         }
+       } finally {
+         await element.dispose().catch(() => {});
        }
      }
    }
@@ -1014,7 +1059,9 @@ export class BrowserWsServer {
     logDebug('browser-service', 'containerOperation', { sessionId, command });
     const pageContext = command.page_context || {};
     if (command.action === 'match_root') {
-      const match = await this.matcher.matchRoot(session, pageContext);
+      const match = await this.matchRootShared(sessionId, session, pageContext, {
+        includeDefinition: Boolean(command.parameters?.include_definition),
+      });
       if (!match) {
         return {
           success: false,
@@ -1048,6 +1095,22 @@ export class BrowserWsServer {
     throw new Error(`Unsupported container action: ${command.action}`);
   }
 
+  private matchRootShared(
+    sessionId: string,
+    session: AutomationSession,
+    pageContext: { url: string },
+    options: { includeDefinition: boolean },
+  ) {
+    const key = `${sessionId}\n${pageContext?.url || ''}\n${options.includeDefinition ? 1 : 0}`;
+    const pending = this.inflightRootMatches.get(key);
+    if (pending) return pending;
+    const task = this.matcher.matchRoot(session, pageContext, options).finally(() => {
+      this.inflightRootMatches.delete(key);
+    });
+    this.inflightRootMatches.set(key, task);
+    return task;
+  }
+
   private async handleNodeExecute(sessionId: string, command: CommandPayload) {
     if (!sessionId) {
       throw new Error('session_id required for node_execute');
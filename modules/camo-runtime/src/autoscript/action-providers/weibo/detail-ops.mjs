@@ -160,20 +160,30 @@ export async function downloadVideo(url, destDir, index) {
   const normalized = String(url).trim();
   if (!normalized || !/^https?:/i.test(normalized)) return null;
 
+  let partPath = null;
+  const { default: fs } = await import('node:fs/promises');
   try {
     const res = await fetch(normalized);
-    if (!res.ok) return null;
-    const buf = Buffer.from(await res.arrayBuffer());
-    if (buf.length < 10240) return null;
+    if (!res.ok || !res.body) return null;
     const ext = normalized.match(/\.(mp4|webm|mov|avi)/i)?.[1] || 'mp4';
     const filename = `${String(index).padStart(2, '0')}.${ext}`;
-    const { default: fs } = await import('node:fs/promises');
     const path = await import('node:path');
+    const { createWriteStream } = await import('node:fs');
+    const { Readable } = await import('node:stream');
+    const { pipeline } = await import('node:stream/promises');
     const filepath = path.join(destDir, filename);
     await fs.mkdir(destDir, { recursive: true });
-    await fs.writeFile(filepath, buf);
+    // 视频体积大：响应流式写入临时文件，不在内存中缓冲整个文件；校验大小后再改名
+    partPath = `${filepath}.part`;
+    await pipeline(Readable.fromWeb(res.body), createWriteStream(partPath));
+    const { size } = await fs.stat(partPath);
+    if (size < 10240) return null;
+    await fs.rename(partPath, filepath);
+    partPath = null;
     return path.join('videos', filename);
   } catch {
     return null;
+  } finally {
+    if (partPath) await fs.rm(partPath, { force: true }).catch(() => {});
   }
 }
@@ -7,6 +7,42 @@
 import { devtoolsEval, runCamo, sleep } from './common.mjs';
 import { SELECTORS_USER_POSTS, URL_PATTERNS, isLoginPage } from './selectors.mjs';
 
+// 风控检测脚本不依赖参数：模块加载时构建一次
+const RISK_CONTROL_CHECK_JS = `
+const result = {
+  isRisk: false,
+  riskType: null,
+  url: location.href,
+  title: document.title
+};
+
+// 检查是否为登录页
+if (location.href.includes("newlogin") || location.href.includes("login")) {
+  result.isRisk = true;
+  result.riskType = "login_redirect";
+}
+
+// 页面文本只读取一次，各项提示共用
+const bodyText = document.body.textContent || "";
+
+// 检查是否有验证码提示
+if (bodyText.includes("验证码") || bodyText.includes("频繁")) {
+  result.isRisk = true;
+  result.riskType = "captcha_detected";
+}
+
+// 检查是否有异常提示
+const alertTexts = ["异常", "频繁操作", "暂时限制", "请稍后再试"];
+alertTexts.forEach(text => {
+  if (bodyText.includes(text)) {
+    result.isRisk = true;
+    result.riskType = "rate_limit";
+  }
+});
+
+return result;
+`;
+
 /**
  * 访问用户主页并提取最新微博
  * 
@@ -22,23 +58,11 @@ export async function fetchUserLatestPosts(profileId, uid) {
   // 2. 等待页面加载
   await sleep(3000);
   
-  // 3. 检查是否为登录页
-  const url = await devtoolsEval(profileId, 'location.href');
-  if (isLoginPage(String(url || ''))) {
-    return {
-      success: false,
-      uid,
-      posts: [],
-      latestWeiboId: null,
-      error: 'login_page_detected',
-      message: '检测到登录页，可能触发风控',
-    };
-  }
-  
-  // 4. 提取微博列表（只提取目标用户的帖子）
+  // 3. 提取微博列表（只提取目标用户的帖子）；页面 URL 随同一次 eval 返回，用于登录页检查
   const script = `
 const targetUid = "${uid}";
 const result = {
+  url: location.href,
   uid: targetUid,
   posts: [],
   articleCount: 0,
@@ -61,16 +85,11 @@ document.querySelectorAll("article").forEach((article, idx) => {
     isOwnPost: false
   };
   
-  // 检查是否是目标用户的帖子
-  // 方法1：检查用户链接是否存在 /u/{targetUid}
-  const userLink = article.querySelector("a[href*='/u/" + targetUid + "']");
-  
-  // 方法2：检查微博链接是否匹配目标 UID
+  // 检查是否是目标用户的帖子：微博链接是否匹配目标 UID
   article.querySelectorAll("a[href]").forEach(link => {
     const href = link.getAttribute("href") || "";
-    // 匹配微博链接格式：/{uid}/{weiboId} 或 /u/{uid}
+    // 匹配微博链接格式：/{uid}/{weiboId}
     const weiboMatch = href.match(/\\/(\\d+)\\/([A-Za-z0-9]+)/);
-    const userMatch = href.match(/\\/u\\/(\\d+)/);
     
     if (weiboMatch && weiboMatch[1] === targetUid) {
       post.uid = weiboMatch[1];
@@ -115,6 +134,18 @@ return result;
 
   const evalResult = await devtoolsEval(profileId, script);
   
+  // 4. 检查是否为登录页
+  if (isLoginPage(String(evalResult?.url || ''))) {
+    return {
+      success: false,
+      uid,
+      posts: [],
+      latestWeiboId: null,
+      error: 'login_page_detected',
+      message: '检测到登录页，可能触发风控',
+    };
+  }
+  
   if (!evalResult) {
     return {
       success: false,
@@ -202,7 +233,8 @@ export async function batchCheckForNewPosts(profileId, users, options = {}) {
   const results = [];
   let newCount = 0;
   
-  for (const user of users) {
+  for (let i = 0; i < users.length; i++) {
+    const user = users[i];
     const checkResult = await checkForNewPosts(profileId, user.uid, user.lastWeiboId);
     
     results.push({
@@ -221,7 +253,7 @@ export async function batchCheckForNewPosts(profileId, users, options = {}) {
     }
     
     // 延迟（避免风控）
-    if (users.indexOf(user) < users.length - 1) {
+    if (i < users.length - 1) {
       await sleep(delayMs);
     }
   }
@@ -241,39 +273,7 @@ export async function batchCheckForNewPosts(profileId, users, options = {}) {
  * @returns {Promise<{isRisk: boolean, riskType: string|null, message: string}>}
  */
 export async function checkRiskControl(profileId) {
-  const script = `
-const result = {
-  isRisk: false,
-  riskType: null,
-  url: location.href,
-  title: document.title
-};
-
-// 检查是否为登录页
-if (location.href.includes("newlogin") || location.href.includes("login")) {
-  result.isRisk = true;
-  result.riskType = "login_redirect";
-}
-
-// 检查是否有验证码提示
-if (document.body.textContent?.includes("验证码") || document.body.textContent?.includes("频繁")) {
-  result.isRisk = true;
-  result.riskType = "captcha_detected";
-}
-
-// 检查是否有异常提示
-const alertTexts = ["异常", "频繁操作", "暂时限制", "请稍后再试"];
-alertTexts.forEach(text => {
-  if (document.body.textContent?.includes(text)) {
-    result.isRisk = true;
-    result.riskType = "rate_limit";
-  }
-});
-
-return result;
-`;
-
-  const evalResult = await devtoolsEval(profileId, script);
+  const evalResult = await devtoolsEval(profileId, RISK_CONTROL_CHECK_JS);
   
   return {
     isRisk: evalResult?.isRisk || false,
@@ -26,8 +26,7 @@ import {
  */
 export async function checkPageState(profileId) {
   const url = await devtoolsEval(profileId, 'location.href');
-  const currentUid = extractUidFromUrl(url, URL_PATTERNS.userHomePage) ||
-                      extractUidFromUrl(url, URL_PATTERNS.followListPage);
+  const currentUid = extractUidFromUrl(url, URL_PATTERNS.currentUserPage);
   
   return {
     url: String(url || ''),
@@ -127,9 +126,10 @@ export async function extractUserUidAndFollowLink(profileId) {
     allAvatarLinks: []
   };
   
-  // 查找头像链接（获取当前用户 UID）
+  // 一次遍历所有链接：同时查找头像链接（获取当前用户 UID）和"我的关注"链接（可能在用户菜单中）
   document.querySelectorAll("a[href]").forEach(el => {
     const href = el.getAttribute("href") || "";
+    const text = el.textContent?.trim();
     
     // 头像链接模式: /u/{uid}
     const uidMatch = href.match(/\\/u\\/(\\d+)/);
@@ -137,7 +137,7 @@ export async function extractUserUidAndFollowLink(profileId) {
       result.allAvatarLinks.push({
         href: href,
         uid: uidMatch[1],
-        text: el.textContent?.trim().slice(0, 30)
+        text: text?.slice(0, 30)
       });
       
       // 优先选择头像区域（通常是最短链接）
@@ -146,12 +146,6 @@ export async function extractUserUidAndFollowLink(profileId) {
         result.avatarLink = href;
       }
     }
-  });
-  
-  // 查找"我的关注"链接（可能在用户菜单中）
-  document.querySelectorAll("a[href]").forEach(el => {
-    const text = el.textContent?.trim();
-    const href = el.getAttribute("href") || "";
     
     if (text && (text.includes("我的关注") || text.includes("关注"))) {
       if (href.includes("/page/follow") || href.includes("/follow")) {
@@ -81,11 +81,13 @@ export async function scrollToLoadAllUsers(profileId, options = {}) {
  * 
  * @param {string} profileId - 浏览器 profile ID
  * @param {boolean} scrollFirst - 是否先滚动加载完整列表
+ * @param {object} [options]
+ * @param {string} [options.url] - 调用方已读取的当前页面 URL（同一页面内复用，省去一次 devtools eval）
  * @returns {Promise<{success: boolean, users: Array<{uid: string, name: string}>, total: number, error?: string}>}
  */
-export async function extractUserList(profileId, scrollFirst = true) {
+export async function extractUserList(profileId, scrollFirst = true, options = {}) {
   // 1. 检查是否为登录页
-  const url = await devtoolsEval(profileId, 'location.href');
+  const url = options.url ?? await devtoolsEval(profileId, 'location.href');
   if (isLoginPage(String(url || ''))) {
     return {
       success: false,
@@ -217,14 +219,15 @@ export async function checkHasMoreUsers(profileId) {
  * @param {object} options - 提取选项
  * @param {boolean} options.autoScroll - 是否自动滚动加载完整列表
  * @param {number} options.maxScrolls - 最大滚动次数
+ * @param {string} [options.url] - 调用方已读取的当前页面 URL（仅用于滚动前的首次提取）
  * @returns {Promise<{success: boolean, users: Array<{uid: string, name: string}>, total: number, scrollStats?: object}>}
  */
 export async function extractCompleteUserList(profileId, options = {}) {
   const autoScroll = options.autoScroll !== false;
   const maxScrolls = options.maxScrolls || 100;
   
-  // 1. 提取初始用户列表
-  const initialResult = await extractUserList(profileId, false);
+  // 1. 提取初始用户列表（调用方已读取的 URL 只用于这一次）
+  const initialResult = await extractUserList(profileId, false, { url: options.url });
   
   if (!initialResult.success) {
     return initialResult;
@@ -247,7 +250,7 @@ export async function extractCompleteUserList(profileId, options = {}) {
   // 3. 滚动加载完整列表
   const scrollResult = await scrollToLoadAllUsers(profileId, { maxScrolls });
   
-  // 4. 再次提取用户列表
+  // 4. 再次提取用户列表：滚动期间可能被重定向到登录/风控页，重新读取当前 URL
   const finalResult = await extractUserList(profileId, false);
   
   return {
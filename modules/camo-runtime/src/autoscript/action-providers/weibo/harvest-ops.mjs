@@ -8,6 +8,20 @@ import path from 'node:path';
 import { captureScreenshotToFile, sanitizeFileComponent } from '../../shared/diagnostic-utils.mjs';
 import { ensureDir } from '../../shared/persistence.mjs';
 
+// 图片下载并发数：小批量并行，避免对 CDN 瞬间发起过多请求
+const IMAGE_DOWNLOAD_CONCURRENCY = 3;
+
+// 详情正文锚点检查脚本：轮询等待时每 300ms 执行一次，模块加载时构建一次
+const CONTENT_ANCHORS = ['[class*="detail_wbtext"]', '.wbpro-feed-content', '[class*="wbtext"]'];
+const CONTENT_ANCHOR_CHECK_JS = `(() => {
+  const sels = ${JSON.stringify(CONTENT_ANCHORS)};
+  for (const s of sels) {
+    const el = document.querySelector(s);
+    if (el && el.textContent.trim().length > 0) return true;
+  }
+  return false;
+})()`;
+
 export async function downloadWithRetry(url, destDir, index, maxRetries = 3) {
   for (let attempt = 0; attempt <= maxRetries; attempt++) {
     try {
@@ -59,28 +73,20 @@ export async function executeHarvestDetailOperation({ profileId, params = {} } =
 
   trace.pushTrace({ action: 'open_detail', ok: true, elapsed: openResult.elapsed });
 
+  // 正文锚点在 waitForDetailPage 中已确认，这里的固定等待留给图片/视频等晚于正文加载的媒体
   await sleep(1500);
 
   let snapshot = {};
   if (contentEnabled || imagesEnabled || videosEnabled || linksEnabled) {
     // Fix 3: anchor-driven wait for content container before snapshot
     if (contentEnabled) {
-      const contentAnchors = ['[class*="detail_wbtext"]', '.wbpro-feed-content', '[class*="wbtext"]'];
       let contentReady = false;
       for (let retry = 0; retry < 2 && !contentReady; retry++) {
         const anchorStart = Date.now();
         const anchorTimeout = retry === 0 ? 5000 : 3000;
         while (Date.now() - anchorStart < anchorTimeout) {
-          const checkScript = `(() => {
-            const sels = ${JSON.stringify(contentAnchors)};
-            for (const s of sels) {
-              const el = document.querySelector(s);
-              if (el && el.textContent.trim().length > 0) return true;
-            }
-            return false;
-          })()`;
           try {
-            const found = await devtoolsEval(profileId, checkScript);
+            const found = await devtoolsEval(profileId, CONTENT_ANCHOR_CHECK_JS);
             if (found) { contentReady = true; break; }
           } catch {}
           await sleep(300);
@@ -95,59 +101,78 @@ export async function executeHarvestDetailOperation({ profileId, params = {} } =
 
   trace.pushTrace({ action: 'read_snapshot', hasContent: !!snapshot.contentText, imageCount: snapshot.images?.length || 0, videoCount: snapshot.videos?.length || 0 });
 
-  let images = [];
-  if (imagesEnabled && snapshot.images?.length > 0) {
-    const imagesDir = params.imagesDir;
-    if (imagesDir) {
-      for (let i = 0; i < snapshot.images.length; i++) {
-        const rawUrl = snapshot.images[i];
-        const upgradedUrl = rawUrl
-          ? rawUrl.replace(/\/orj480\//, '/large/').replace(/\/orj360\//, '/large/')
-          : rawUrl;
-        const result = await downloadWithRetry(upgradedUrl, imagesDir, i);
-        if (result) images.push(result);
+  // 图片/视频由 Node 侧直接 fetch 下载，与浏览器内的评论滚动/提取互不依赖：并行进行，返回前再汇合
+  // 立即转成 settled 结果，评论阶段进行中下载失败也不会成为 unhandled rejection
+  const mediaSettled = (async () => {
+    let images = [];
+    let videos = [];
+    if (imagesEnabled && snapshot.images?.length > 0) {
+      const imagesDir = params.imagesDir;
+      if (imagesDir) {
+        // 按批并发下载（每批 IMAGE_DOWNLOAD_CONCURRENCY 张），结果仍按原图序号排列
+        for (let start = 0; start < snapshot.images.length; start += IMAGE_DOWNLOAD_CONCURRENCY) {
+          const batch = snapshot.images.slice(start, start + IMAGE_DOWNLOAD_CONCURRENCY);
+          const results = await Promise.all(batch.map((rawUrl, offset) => {
+            const upgradedUrl = rawUrl
+              ? rawUrl.replace(/\/orj480\//, '/large/').replace(/\/orj360\//, '/large/')
+              : rawUrl;
+            return downloadWithRetry(upgradedUrl, imagesDir, start + offset);
+          }));
+          for (const result of results) {
+            if (result) images.push(result);
+          }
+        }
+      } else {
+        images = snapshot.images;
       }
-    } else {
-      images = snapshot.images;
     }
-  }
 
-  let videos = [];
-  if (videosEnabled && snapshot.videos?.length > 0) {
-    const videosDir = params.videosDir;
-    if (videosDir) {
-      for (let i = 0; i < snapshot.videos.length; i++) {
-        const result = await downloadVideo(snapshot.videos[i], videosDir, i);
-        if (result) videos.push(result);
+    if (videosEnabled && snapshot.videos?.length > 0) {
+      const videosDir = params.videosDir;
+      if (videosDir) {
+        for (let i = 0; i < snapshot.videos.length; i++) {
+          const result = await downloadVideo(snapshot.videos[i], videosDir, i);
+          if (result) videos.push(result);
+        }
+      } else {
+        videos = snapshot.videos;
       }
-    } else {
-      videos = snapshot.videos;
     }
-  }
+    return { images, videos };
+  })().then((value) => ({ value }), (error) => ({ error }));
 
   let commentsResult = { comments: [], total: 0 };
   let commentScrollResult = null;
-  if (commentsEnabled) {
-    await sleep(1000);
-    const isEmpty = await isCommentPanelEmpty(profileId).catch(() => true);
-    if (!isEmpty) {
-      commentScrollResult = await scrollCommentsToBottom(profileId, {
-        maxScrolls: 50,
-        scrollIntervalMs: 800,
-        bottomSelector,
-        bottomText,
-        maxComments,
-      });
-      if (expandAllReplies) {
-        const expandResult = await expandAllSubReplies(profileId).catch(() => null);
-        if (expandResult) trace.pushTrace({ action: 'expand_sub_replies', expanded: expandResult.expanded });
+  let media;
+  try {
+    if (commentsEnabled) {
+      await sleep(1000);
+      const isEmpty = await isCommentPanelEmpty(profileId).catch(() => true);
+      if (!isEmpty) {
+        commentScrollResult = await scrollCommentsToBottom(profileId, {
+          maxScrolls: 50,
+          scrollIntervalMs: 800,
+          bottomSelector,
+          bottomText,
+          maxComments,
+        });
+        if (expandAllReplies) {
+          const expandResult = await expandAllSubReplies(profileId).catch(() => null);
+          if (expandResult) trace.pushTrace({ action: 'expand_sub_replies', expanded: expandResult.expanded });
+        }
+        commentsResult = await extractComments(profileId).catch(() => ({ comments: [], total: 0 }));
       }
-      commentsResult = await extractComments(profileId).catch(() => ({ comments: [], total: 0 }));
     }
+  } finally {
+    // 评论阶段抛错时也先等下载结束再向上抛，调用方看到失败后不会再有文件写入 imagesDir/videosDir
+    media = await mediaSettled;
   }
 
   trace.pushTrace({ action: 'extract_comments', count: commentsResult.total || 0 });
 
+  if (media.error) throw media.error;
+  const { images, videos } = media.value;
+
   if (snapshot.postIdFromUrl) state.visitedPostIds.push(snapshot.postIdFromUrl);
   state.metrics.harvestCount++;
   state.metrics.lastHarvestAt = new Date().toISOString();
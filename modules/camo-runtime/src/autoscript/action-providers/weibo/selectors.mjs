@@ -119,8 +119,17 @@ export const URL_PATTERNS = {
   // 微博详情页
   // /{uid}/{weiboId}
   postDetail: /\/(\d+)\/([A-Za-z0-9]+)/,
+
+  // 用户主页或关注列表页（合并 userHomePage / followListPage，一次匹配取 UID）
+  // /u/{uid} 或 /u/page/follow/{uid}
+  currentUserPage: /\/u\/(?:page\/follow\/)?(\d+)/,
 };
 
+// 登录页关键词预编译为一个正则，避免每次检查逐个关键词扫描 URL
+const LOGIN_URL_RE = new RegExp(
+  SELECTORS_RISK_CONTROL.loginUrlKeywords.map((kw) => kw.replace(/[.*+?^${}()|[\]\\]/g, '\\$&')).join('|'),
+);
+
 // ============================================
 // 辅助函数
 // ============================================
@@ -156,7 +165,7 @@ export function extractTabidFromHref(href) {
  * @returns {boolean} - 是否为登录页
  */
 export function isLoginPage(url) {
-  return SELECTORS_RISK_CONTROL.loginUrlKeywords.some(kw => url?.includes?.(kw));
+  return typeof url === 'string' && LOGIN_URL_RE.test(url);
 }
 
 /**
@@ -18,10 +18,12 @@ export function defaultWeiboProfileState() {
 
 export function getWeiboProfileState(profileId) {
   const key = String(profileId || '').trim() || 'default';
-  if (!WEIBO_PROFILE_STATE.has(key)) {
-    WEIBO_PROFILE_STATE.set(key, defaultWeiboProfileState());
+  let state = WEIBO_PROFILE_STATE.get(key);
+  if (!state) {
+    state = defaultWeiboProfileState();
+    WEIBO_PROFILE_STATE.set(key, state);
   }
-  return WEIBO_PROFILE_STATE.get(key);
+  return state;
 }
 
 export function clearWeiboProfileState(profileId) {
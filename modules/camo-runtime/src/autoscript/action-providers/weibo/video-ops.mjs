@@ -14,8 +14,8 @@ async function callAPI(action, payload = {}, timeoutMs = 20000) {
   return r.json();
 }
 
-const WEIBO_HOST_RE = /(^|\.)(weibo\.com|weibo\.cn|t\.cn)$/i;
-const XHS_HOST_RE = /(^|\.)(xiaohongshu\.com|xhslink\.com|xhs\.cn)$/i;
+// 各平台域名合并为一个锚定正则，按命名分组判定平台，一次匹配完成
+const PLATFORM_HOST_RE = /(?:^|\.)(?:(?<weibo>weibo\.com|weibo\.cn|t\.cn)|(?<xhs>xiaohongshu\.com|xhslink\.com|xhs\.cn)|(?<bilibili>bilibili\.com|b23\.tv))$/i;
 
 /**
  * Detect platform from URL hostname.
@@ -25,10 +25,9 @@ export function detectPlatform(url) {
   const normalized = String(url || '').trim();
   let hostname = '';
   try { hostname = new URL(normalized.startsWith('http') ? normalized : 'https://' + normalized).hostname; } catch { hostname = normalized; }
-  if (WEIBO_HOST_RE.test(hostname)) return { platform: 'weibo', host: hostname, fullUrl: normalized };
-  if (XHS_HOST_RE.test(hostname)) return { platform: 'xhs', host: hostname, fullUrl: normalized };
-  if (/bilibili\.com|b23\.tv/i.test(hostname)) return { platform: 'bilibili', host: hostname, fullUrl: normalized };
-  return { platform: 'unknown', host: hostname, fullUrl: normalized };
+  const groups = PLATFORM_HOST_RE.exec(hostname)?.groups;
+  const platform = groups ? (groups.weibo ? 'weibo' : groups.xhs ? 'xhs' : 'bilibili') : 'unknown';
+  return { platform, host: hostname, fullUrl: normalized };
 }
 
 /**
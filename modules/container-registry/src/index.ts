@@ -10,6 +10,11 @@ const PROJECT_ROOT = resolveProjectRoot(__dirname);
 const PRIMARY_USER_CONTAINER_ROOT =
   process.env.WEBAUTO_CONTAINER_ROOT || path.join(os.homedir(), '.webauto', 'container-lib');
 const INDEX_PATH = path.join(PROJECT_ROOT, 'apps/webauto/resources/container-library.index.json');
+// 站点容器的内存缓存有效期：短时间内的重复查询（match_root / inspect_tree / operation）复用同一份结果，
+// 过期后重新读取磁盘，用户容器定义的变更仍能被及时感知。设为 0 关闭缓存。
+const SITE_CACHE_TTL_MS = resolveCacheTtl(process.env.WEBAUTO_CONTAINER_CACHE_TTL_MS, 2000);
+// host -> siteKey 记忆的条目上限（子域名很多时避免无限增长）
+const SITE_KEY_MEMO_LIMIT = 1024;
 
 function isLegacyContainer(definition: any): boolean {
   try {
@@ -43,6 +48,8 @@ type RegistryIndex = Record<string, { website?: string; path?: string }>;
 
 export class ContainerRegistry {
   private indexCache: RegistryIndex | null = null;
+  private siteKeyByHost = new Map<string, string | null>();
+  private siteCache = new Map<string, { containers: Record<string, ContainerDefinition>; loadedAt: number }>();
 
   listSites() {
     const registry = this.ensureIndex();
@@ -71,6 +78,20 @@ export class ContainerRegistry {
     return;
   }
 
+  /**
+   * 丢弃站点容器缓存（容器定义热更新后调用）；不传 siteKey 时清空全部。
+   */
+  invalidate(siteKey?: string) {
+    if (siteKey) {
+      this.siteCache.delete(siteKey);
+    } else {
+      this.siteCache.clear();
+    }
+  }
+
+  /**
+   * 返回的容器表在缓存有效期内会被多个调用方共享，调用方应视为只读。
+   */
   getContainersForUrl(url: string): Record<string, ContainerDefinition> {
     const registry = this.ensureIndex();
     const siteKey = this.findSiteKey(url, registry);
@@ -82,9 +103,23 @@ export class ContainerRegistry {
   }
 
   private fetchContainersForSite(siteKey: string, site: { path?: string }) {
-    // 不做内存级别缓存，确保用户容器定义变更后，每次调用都能读取到最新文件。
+    // 仅做短 TTL 的内存缓存，过期后重新读取，确保用户容器定义变更能被感知。
     // 内部会同时加载内置容器与用户容器目录并合并。
-    return this.loadSiteContainers(siteKey, site?.path);
+    if (SITE_CACHE_TTL_MS <= 0) {
+      return this.loadSiteContainers(siteKey, site?.path);
+    }
+    const now = Date.now();
+    const cached = this.siteCache.get(siteKey);
+    if (cached && now - cached.loadedAt < SITE_CACHE_TTL_MS) {
+      return cached.containers;
+    }
+    const containers = this.loadSiteContainers(siteKey, site?.path);
+    // 写入前清掉已过期的站点：长期运行的服务访问过很多站点时，不再常驻全部容器表
+    for (const [key, entry] of this.siteCache) {
+      if (now - entry.loadedAt >= SITE_CACHE_TTL_MS) this.siteCache.delete(key);
+    }
+    this.siteCache.set(siteKey, { containers, loadedAt: now });
+    return containers;
   }
 
   private ensureIndex(): RegistryIndex {
@@ -183,6 +218,11 @@ export class ContainerRegistry {
     } catch {
       return null;
     }
+    // 站点只由 hostname 决定（query / path 不影响），索引加载后不再变化，按 host 记忆结果
+    const known = this.siteKeyByHost.get(host);
+    if (known !== undefined) {
+      return known;
+    }
     let bestKey: string | null = null;
     let bestLen = -1;
     for (const [key, value] of Object.entries(registry)) {
@@ -195,6 +235,10 @@ export class ContainerRegistry {
         }
       }
     }
+    if (this.siteKeyByHost.size >= SITE_KEY_MEMO_LIMIT) {
+      this.siteKeyByHost.clear();
+    }
+    this.siteKeyByHost.set(host, bestKey);
     return bestKey;
   }
 }
@@ -212,3 +256,9 @@ function resolveProjectRoot(startDir: string) {
     current = path.resolve(current, '..');
   }
 }
+
+function resolveCacheTtl(raw: string | undefined, fallback: number) {
+  if (raw === undefined || raw === '') return fallback;
+  const value = Number(raw);
+  return Number.isFinite(value) ? Math.max(0, value) : fallback;
+}
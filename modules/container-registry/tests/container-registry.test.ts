@@ -14,3 +14,14 @@ test('listSites contains xiaohongshu entry', () => {
   const hasXhs = sites.some((site) => site.key.includes('xiaohongshu'));
   assert.ok(hasXhs, 'should list xiaohongshu site');
 });
+
+test('getContainersForUrl reuses cached containers until invalidated', () => {
+  const registry = new ContainerRegistry();
+  const first = registry.getContainersForUrl('https://www.xiaohongshu.com/explore?a=1');
+  const second = registry.getContainersForUrl('https://www.xiaohongshu.com/search_result?a=2');
+  assert.equal(second, first, 'same site within TTL should share one load');
+  registry.invalidate();
+  const third = registry.getContainersForUrl('https://www.xiaohongshu.com/explore');
+  assert.notEqual(third, first);
+  assert.deepEqual(Object.keys(third).sort(), Object.keys(first).sort());
+});
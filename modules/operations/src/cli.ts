@@ -1,7 +1,7 @@
 #!/usr/bin/env node
 import path from 'node:path';
 import { fileURLToPath } from 'node:url';
-import { getOperation, listOperations, type OperationContext } from './registry.js';
+import { getOperation, listOperationDescriptions, type OperationContext } from './registry.js';
 import { ensureBuiltinOperations } from './builtin.js';
 
 ensureBuiltinOperations();
@@ -44,7 +44,7 @@ function parseJson(json: string | undefined) {
 async function handleList(): Promise<CliResult> {
   return {
     success: true,
-    data: listOperations().map((op) => ({ id: op.id, description: op.description, requiredCapabilities: op.requiredCapabilities })),
+    data: listOperationDescriptions(),
   };
 }
 
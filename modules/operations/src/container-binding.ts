@@ -9,17 +9,39 @@ export interface ContainerOperationIssue {
   level: 'error' | 'warning';
 }
 
-function hasCapability(container: ContainerDefinition, required?: string[]): boolean {
+// 容器定义加载后只读：小写 capability 集合按 capabilities 数组缓存，校验每个 operation 时复用
+const capabilitySets = new WeakMap<readonly string[], Set<string>>();
+const EMPTY_LIST: readonly any[] = [];
+
+function capabilitySetOf(container: ContainerDefinition): Set<string> {
+  const capabilities = container.capabilities || EMPTY_LIST;
+  let capabilitySet = capabilitySets.get(capabilities);
+  if (!capabilitySet) {
+    capabilitySet = new Set(capabilities.map((c: string) => c.toLowerCase()));
+    capabilitySets.set(capabilities, capabilitySet);
+  }
+  return capabilitySet;
+}
+
+function hasCapability(container: ContainerDefinition, required?: readonly string[]): boolean {
   if (!required || !required.length) {
     return true;
   }
-  const capabilitySet = new Set((container.capabilities || []).map((c: string) => c.toLowerCase()));
+  const capabilitySet = capabilitySetOf(container);
   return required.every((cap) => capabilitySet.has(cap.toLowerCase()));
 }
 
+// 同理：容器声明的 operation id 集合按 operations 数组缓存，入队校验时不再逐项扫描
+const declaredOperationSets = new WeakMap<readonly any[], Set<string>>();
+
 function isOperationListed(container: ContainerDefinition, operationId: string): boolean {
-  const declared = container.operations || [];
-  return declared.some((item: any) => (item?.type || item?.id) === operationId);
+  const declared = container.operations || EMPTY_LIST;
+  let declaredSet = declaredOperationSets.get(declared);
+  if (!declaredSet) {
+    declaredSet = new Set(declared.map((item: any) => item?.type || item?.id));
+    declaredOperationSets.set(declared, declaredSet);
+  }
+  return declaredSet.has(operationId);
 }
 
 export function validateContainerOperations(container: ContainerDefinition): ContainerOperationIssue[] {
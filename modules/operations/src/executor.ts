@@ -21,10 +21,10 @@ export interface OperationContext {
 }
 
 export interface OperationDefinition<TConfig = any> {
-  id: string;
-  description?: string;
-  requiredCapabilities?: string[];
-  run: (ctx: OperationContext, config: TConfig) => Promise<any>;
+  readonly id: string;
+  readonly description?: string;
+  readonly requiredCapabilities?: readonly string[];
+  readonly run: (ctx: OperationContext, config: TConfig) => Promise<any>;
 }
 
 export interface OperationResult {
@@ -49,6 +49,19 @@ function resolveInputMode(): 'system' | 'protocol' {
   return raw === 'protocol' ? 'protocol' : 'system';
 }
 
+// 只读操作：不改变页面状态，同一页面上可并发执行
+const READ_ONLY_OPERATIONS = new Set(['extract', 'find-child']);
+// 受 WEBAUTO_INPUT_MODE 控制输入方式的操作
+const MODE_CONTROLLED_OPERATIONS = new Set(['click', 'type', 'key', 'scroll']);
+// 需要 selector 的操作（缺省时从容器定义补齐）
+const SELECTOR_OPERATIONS = new Set(['highlight', 'click', 'extract', 'type', 'input', 'scroll', 'key']);
+
+export interface ContainerOperationRequest {
+  containerId: string;
+  operationId: string;
+  config?: Record<string, any>;
+}
+
 
 export class ContainerExecutor {
   private operations = new Map<string, OperationDefinition>();
@@ -72,7 +85,7 @@ export class ContainerExecutor {
   }
 
   registerOperation(config: OperationDefinition) {
-    this.operations.set(config.id, config);
+    this.operations.set(config.id, Object.freeze({ ...config }));
   }
 
   async execute(
@@ -90,13 +103,14 @@ export class ContainerExecutor {
       };
     }
 
+    // 每次执行只解析一次容器定义（page.evaluate + registry 查找），后续步骤复用
+    const resolved = await this.getContainerForContext(containerId, context);
+
     // 合并容器定义中的默认 operation config（调用方 config 优先）
-    config = await this.mergeContainerOperationConfig(containerId, operationId, config, context);
+    config = this.mergeContainerOperationConfig(operationId, config, resolved);
 
-    const inputMode = resolveInputMode();
-    const modeControlledOps = new Set(['click', 'type', 'key', 'scroll']);
-    if (modeControlledOps.has(operationId)) {
-      if (inputMode === 'protocol') {
+    if (MODE_CONTROLLED_OPERATIONS.has(operationId)) {
+      if (resolveInputMode() === 'protocol') {
         // Protocol mode bypasses OS-level input so actions can run without window focus.
         config = { ...config, useSystemMouse: false };
       } else if (typeof config.useSystemMouse !== 'boolean') {
@@ -105,13 +119,13 @@ export class ContainerExecutor {
     }
 
     // click：如果调用方明确给了坐标/bbox，则优先走坐标点击，避免被容器默认 selector 覆盖
-    if (
+    const isClickWithCoordinates =
       operationId === 'click' &&
       config &&
       typeof config === 'object' &&
       (Boolean((config as any).bbox) ||
-        (typeof (config as any).x === 'number' && typeof (config as any).y === 'number'))
-    ) {
+        (typeof (config as any).x === 'number' && typeof (config as any).y === 'number'));
+    if (isClickWithCoordinates) {
       const next = { ...(config as any) };
       delete (next as any).selector;
       config = next;
@@ -119,27 +133,15 @@ export class ContainerExecutor {
 
     // extract：注入容器 extractors（兼容 container-library 的 extract operation fields: string[]）
     if (operationId === 'extract' && config && typeof config === 'object' && !('extractors' in config)) {
-      try {
-        const { container } = await this.getContainerForContext(containerId, context);
-        const extractors = (container as any)?.extractors;
-        if (extractors && typeof extractors === 'object' && !Array.isArray(extractors)) {
-          config = { ...config, extractors };
-        }
-      } catch {
-        // ignore
+      const extractors = (resolved.container as any)?.extractors;
+      if (extractors && typeof extractors === 'object' && !Array.isArray(extractors)) {
+        config = { ...config, extractors };
       }
     }
 
     // 如果操作需要 selector，则从容器定义中补齐
-    const isClickWithCoordinates =
-      operationId === 'click' &&
-      config &&
-      typeof config === 'object' &&
-      (Boolean((config as any).bbox) ||
-        (typeof (config as any).x === 'number' && typeof (config as any).y === 'number'));
-
     if (this.requiresSelector(operation) && !config.selector && !isClickWithCoordinates) {
-      const selector = await this.getSelectorForContainer(containerId, context);
+      const selector = this.getSelectorForContainer(resolved.container);
       if (!selector) {
         return {
           success: false,
@@ -152,24 +154,61 @@ export class ContainerExecutor {
     try {
       return await operation.run(context, config);
     } catch (error: any) {
+      // 取消（AbortError）需要向上传播，不能被吞成普通失败结果
+      if (error?.name === 'AbortError') {
+        throw error;
+      }
       return {
         success: false,
-        error: error.message || String(error)
+        error: error?.message || String(error)
       };
     }
   }
 
+  /**
+   * 批量执行操作：相邻的只读操作（extract 等）通过 Promise.all 并发执行，
+   * 交互类操作（click/type/scroll/navigate ...）保持串行并作为并发分组边界。
+   * 结果顺序与 requests 一致。要求 context.page.evaluate 对同一页面可并发调用。
+   */
+  async executeParallel(
+    requests: ContainerOperationRequest[],
+    context: OperationContext
+  ): Promise<OperationResult[]> {
+    const results: OperationResult[] = new Array(requests.length);
+    let i = 0;
+    while (i < requests.length) {
+      if (!READ_ONLY_OPERATIONS.has(requests[i].operationId)) {
+        const { containerId, operationId, config } = requests[i];
+        results[i] = await this.execute(containerId, operationId, config || {}, context);
+        i += 1;
+        continue;
+      }
+      const start = i;
+      while (i < requests.length && READ_ONLY_OPERATIONS.has(requests[i].operationId)) {
+        i += 1;
+      }
+      const group = await Promise.all(
+        requests
+          .slice(start, i)
+          .map(({ containerId, operationId, config }) => this.execute(containerId, operationId, config || {}, context))
+      );
+      for (let j = 0; j < group.length; j++) {
+        results[start + j] = group[j];
+      }
+    }
+    return results;
+  }
+
   private requiresSelector(operation: OperationDefinition): boolean {
-    return ['highlight', 'click', 'extract', 'type', 'input', 'scroll', 'key'].includes(operation.id);
+    return SELECTOR_OPERATIONS.has(operation.id);
   }
 
-  private async mergeContainerOperationConfig(
-    containerId: string,
+  private mergeContainerOperationConfig(
     operationId: string,
     config: Record<string, any>,
-    context: OperationContext
+    resolved: { url: string | null; container: any }
   ) {
-    const { url, container } = await this.getContainerForContext(containerId, context);
+    const { url, container } = resolved;
     if (!url || !container) return config;
     const ops = Array.isArray((container as any).operations) ? (container as any).operations : [];
     const defaultOp = ops.find((op: any) => (op?.type || op?.id) === operationId);
@@ -178,8 +217,7 @@ export class ContainerExecutor {
     return { ...baseConfig, ...config };
   }
 
-  private async getSelectorForContainer(containerId: string, context: OperationContext): Promise<string | null> {
-    const { container } = await this.getContainerForContext(containerId, context);
+  private getSelectorForContainer(container: any): string | null {
     if (!container || !container.selectors || !container.selectors.length) {
       return null;
     }
@@ -110,6 +110,7 @@ async function runClick(ctx: OperationContext, config: ClickConfig) {
         { x: mx, y: Math.round(y2 - pad) },
       ];
 
+      // 只会点击第一个命中点，命中后即停止探测，避免多余的 elementFromPoint 布局查询
       const clickPoints: Array<{ x: number; y: number }> = [];
       for (const p of points) {
         if (!Number.isFinite(p.x) || !Number.isFinite(p.y)) continue;
@@ -117,6 +118,7 @@ async function runClick(ctx: OperationContext, config: ClickConfig) {
         const hit = document.elementFromPoint(p.x, p.y);
         if (hit && (hit === el || el.contains(hit))) {
           clickPoints.push(p);
+          break;
         }
       }
 
@@ -134,17 +136,14 @@ async function runClick(ctx: OperationContext, config: ClickConfig) {
     if (useSystemMouse && !ctx.systemInput?.mouseClick) {
       return { success: false, error: 'system mouse not available' };
     }
-    const clickPoints = (info as { clickPoints: ClickPoint[] }).clickPoints;
     // 优先点击视口内且命中目标元素的点，避免“元素部分可见但中心离屏”导致点错
-    for (const p of clickPoints) {
-      const x = Math.round(p.x);
-      const y = Math.round(p.y);
-      if (useSystemMouse) {
-        await ctx.systemInput!.mouseClick(x, y);
-      } else {
-        await protocolMouse.click(x, y);
-      }
-      break;
+    const [p] = (info as { clickPoints: ClickPoint[] }).clickPoints;
+    const x = Math.round(p.x);
+    const y = Math.round(p.y);
+    if (useSystemMouse) {
+      await ctx.systemInput!.mouseClick(x, y);
+    } else {
+      await protocolMouse.click(x, y);
     }
     return { success: true, inputMode: useSystemMouse ? 'system' : 'protocol' };
 
@@ -82,41 +82,52 @@ async function runExtract(ctx: OperationContext, config: ExtractConfig) {
       const extracted = [];
       const limit = Math.min(roots.length, data.maxItems);
 
-      const getAttrValue = (node: any, attr: string) => {
-        if (!node) return '';
-        if (!attr || attr === 'textContent') return (node.textContent || '').trim();
-        if (attr === 'href') {
-          const href = node.href || (typeof node.getAttribute === 'function' ? node.getAttribute('href') : '') || '';
-          return String(href || '').trim();
-        }
-        if (attr === 'src') {
-          const src = node.currentSrc || node.src || (typeof node.getAttribute === 'function' ? node.getAttribute('src') : '') || '';
-          return String(src || '').trim();
-        }
-        if (typeof node.getAttribute === 'function') {
+      // attr 在每次调用时解析为读取函数一次，逐元素循环中直接调用，避免重复的字符串比较分支
+      const readText = (node: any) => (node.textContent || '').trim();
+      const readHref = (node: any) => {
+        const href = node.href || (typeof node.getAttribute === 'function' ? node.getAttribute('href') : '') || '';
+        return String(href || '').trim();
+      };
+      const readSrc = (node: any) => {
+        const src = node.currentSrc || node.src || (typeof node.getAttribute === 'function' ? node.getAttribute('src') : '') || '';
+        return String(src || '').trim();
+      };
+      const attrReaders = new Map<string, (node: any) => string>([
+        ['textContent', readText],
+        ['href', readHref],
+        ['src', readSrc],
+      ]);
+      const resolveAttrReader = (attr: string) => {
+        const reader = attrReaders.get(attr || 'textContent');
+        if (reader) return reader;
+        return (node: any) => {
+          if (typeof node.getAttribute !== 'function') return '';
           const v = node.getAttribute(attr);
           return v ? String(v).trim() : '';
-        }
-        return '';
+        };
       };
 
       const containerExtractorMode =
         Array.isArray(data.fields) && data.fields.length > 0 && data.extractors && typeof data.extractors === 'object';
 
+      const extractorPlans = containerExtractorMode
+        ? (data.fields as string[]).map((key) => {
+            const def = (data.extractors || {})[key] || {};
+            return {
+              key,
+              selectors: Array.isArray(def.selectors) ? def.selectors : [],
+              read: resolveAttrReader(def.attr || 'textContent'),
+              multiple: !!def.multiple,
+            };
+          })
+        : [];
+
       for (let i = 0; i < limit; i++) {
         const el = roots[i];
         const item: any = {};
 
         if (containerExtractorMode) {
-          const extractorKeys = data.fields as string[];
-          const extractors = data.extractors || {};
-
-          for (const key of extractorKeys) {
-            const def = extractors[key] || {};
-            const selectors = Array.isArray(def.selectors) ? def.selectors : [];
-            const attr = def.attr || 'textContent';
-            const multiple = !!def.multiple;
-
+          for (const { key, selectors, read, multiple } of extractorPlans) {
             if (!selectors.length) {
               item[key] = multiple ? [] : '';
               continue;
@@ -128,7 +139,7 @@ async function runExtract(ctx: OperationContext, config: ExtractConfig) {
                 try {
                   const nodes = Array.from(el.querySelectorAll(sel));
                   for (const n of nodes) {
-                    const v = getAttrValue(n, attr);
+                    const v = read(n);
                     if (v) values.push(v);
                   }
                 } catch {
@@ -143,7 +154,7 @@ async function runExtract(ctx: OperationContext, config: ExtractConfig) {
                 try {
                   const n = el.querySelector(sel);
                   if (!n) continue;
-                  value = getAttrValue(n, attr);
+                  value = read(n);
                   if (value) break;
                 } catch {
                   // ignore selector errors
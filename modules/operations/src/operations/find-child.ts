@@ -1,4 +1,4 @@
-import { OperationDefinition } from '../registry.js';
+import type { OperationDefinition } from '../registry.js';
 
 export interface FindChildConfig {
   container_id: string;
@@ -15,6 +15,11 @@ export interface NavigateConfig {
   mode?: 'assign' | 'replace' | 'href';
   wait_after_ms?: number;
   waitAfterMs?: number;
+  /** 导航完成信号：等待 URL 匹配该正则的网络响应（适用于 SPA 以 XHR 结束加载的页面） */
+  wait_for_response?: string;
+  waitForResponse?: string;
+  wait_for_response_timeout_ms?: number;
+  waitForResponseTimeoutMs?: number;
 }
 
 interface NavigateResult {
@@ -28,6 +33,52 @@ function resolveWaitAfter(config: NavigateConfig): number {
   return Number.isFinite(wait) ? Math.max(0, wait!) : 0;
 }
 
+// 相同的 wait_for_response 字符串复用已编译的 RegExp（工作流循环中同一导航会反复执行）
+const RESPONSE_PATTERN_CACHE_LIMIT = 64;
+const responsePatternCache = new Map<string, RegExp>();
+
+function compileResponsePattern(raw: string): RegExp {
+  const cached = responsePatternCache.get(raw);
+  if (cached) return cached;
+  const pattern = new RegExp(raw);
+  if (responsePatternCache.size >= RESPONSE_PATTERN_CACHE_LIMIT) {
+    const oldest = responsePatternCache.keys().next().value;
+    if (oldest !== undefined) responsePatternCache.delete(oldest);
+  }
+  responsePatternCache.set(raw, pattern);
+  return pattern;
+}
+
+// 失败路径的固定前缀：重试/轮询时只做一次拼接
+const GOTO_FAILED_PREFIX = 'navigate: page.goto failed: ';
+const RESPONSE_NOT_OBSERVED_PREFIX = 'navigate: response not observed: ';
+
+function errorMessage(e: any): string {
+  return e?.message || String(e);
+}
+
+function resolveResponseWait(
+  config: NavigateConfig,
+): { source: string; pattern: RegExp; timeout: number } | { error: string } | null {
+  const raw = config.waitForResponse || config.wait_for_response;
+  if (!raw) return null;
+  let pattern: RegExp;
+  try {
+    pattern = compileResponsePattern(raw);
+  } catch (e: any) {
+    return { error: `navigate: invalid wait_for_response pattern: ${errorMessage(e)}` };
+  }
+  const timeout =
+    typeof config.waitForResponseTimeoutMs === 'number'
+      ? config.waitForResponseTimeoutMs
+      : config.wait_for_response_timeout_ms;
+  return {
+    source: raw,
+    pattern,
+    timeout: Number.isFinite(timeout) ? Math.max(0, timeout!) : 15000,
+  };
+}
+
 function ensureAbsoluteUrl(raw: string, base?: string): string {
   if (!raw) return '';
   if (/^https?:\/\//i.test(raw)) return raw;
@@ -156,10 +207,30 @@ export async function runNavigateOperation(ctx: OperationContext, config: Naviga
     return { success: false, error: `navigate: disabled for xiaohongshu url=${target.url}` };
   }
 
+  // 在 goto 之前挂上响应监听，避免响应早于监听注册而被错过
+  const responseWait = resolveResponseWait(config);
+  if (responseWait && 'error' in responseWait) {
+    return { success: false, error: responseWait.error };
+  }
+  const page = ctx.page as any;
+  const responsePromise: Promise<any> | null =
+    responseWait && typeof page.waitForResponse === 'function'
+      ? page
+          .waitForResponse((resp: any) => responseWait.pattern.test(resp.url()), { timeout: responseWait.timeout })
+          .catch((e: any) => ({ __error: e }))
+      : null;
+
   try {
-    await (ctx.page as any).goto(target.url, { waitUntil: 'domcontentloaded' });
+    await page.goto(target.url, { waitUntil: 'domcontentloaded' });
   } catch (e: any) {
-    return { success: false, error: `navigate: page.goto failed: ${e?.message || String(e)}` };
+    return { success: false, error: GOTO_FAILED_PREFIX + errorMessage(e) };
+  }
+
+  if (responsePromise) {
+    const response = await responsePromise;
+    if (response?.__error) {
+      return { success: false, error: RESPONSE_NOT_OBSERVED_PREFIX + responseWait!.source + ': ' + errorMessage(response.__error) };
+    }
   }
 
   const waitAfter = resolveWaitAfter(config);
@@ -53,6 +53,7 @@ export class ContainerOperationQueue extends EventEmitter {
   enqueue(container: ContainerDefinition, operationId: string, config: OperationTaskConfig = {}) {
     containerAllowsOperation(container, operationId);
     const queue = this.ensureQueue(container.id);
+    // 所有字段在创建时一次性声明，避免 runTask 中追加属性导致对象 shape 迁移
     const task: OperationTask = {
       id: `${container.id}:${operationId}:${Date.now()}:${this.taskCounter++}`,
       container,
@@ -61,6 +62,10 @@ export class ContainerOperationQueue extends EventEmitter {
       config: (config.config || {}) as Record<string, any>,
       status: 'pending',
       enqueuedAt: Date.now(),
+      startedAt: undefined,
+      finishedAt: undefined,
+      result: undefined,
+      error: undefined,
       event: config.event,
     };
     queue.push(task);
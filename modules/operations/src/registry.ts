@@ -21,22 +21,47 @@ export interface OperationContext {
 }
 
 export interface OperationDefinition<TConfig = any> {
-  id: string;
-  description?: string;
-  requiredCapabilities?: string[];
-  run: (ctx: OperationContext, config: TConfig) => Promise<any>;
+  readonly id: string;
+  readonly description?: string;
+  readonly requiredCapabilities?: readonly string[];
+  readonly run: (ctx: OperationContext, config: TConfig) => Promise<any>;
+}
+
+export interface OperationDescription {
+  readonly id: string;
+  readonly description?: string;
+  readonly requiredCapabilities?: readonly string[];
 }
 
 const registry = new Map<string, OperationDefinition>();
+// 描述信息在注册时一次性构建，list/describe 只做查表，不在每次轮询时重建对象
+const descriptions = new Map<string, OperationDescription>();
 
 export function registerOperation<TConfig>(definition: OperationDefinition<TConfig>) {
-  registry.set(definition.id, definition as OperationDefinition);
+  // 注册后的定义只读：保存冻结的浅拷贝，避免调用方后续修改影响已注册操作
+  registry.set(definition.id, Object.freeze({ ...definition }) as OperationDefinition);
+  descriptions.set(
+    definition.id,
+    Object.freeze({
+      id: definition.id,
+      description: definition.description,
+      requiredCapabilities: definition.requiredCapabilities,
+    }),
+  );
 }
 
 export function getOperation(id: string) {
   return registry.get(id);
 }
 
+export function describeOperation(id: string) {
+  return descriptions.get(id);
+}
+
 export function listOperations() {
   return Array.from(registry.values());
 }
+
+export function listOperationDescriptions() {
+  return Array.from(descriptions.values());
+}
@@ -0,0 +1,75 @@
+import test from 'node:test';
+import assert from 'node:assert/strict';
+import { ContainerExecutor } from '../src/executor.js';
+
+function createContext(log: string[]) {
+  let inFlight = 0;
+  let maxInFlight = 0;
+  const context: any = {
+    page: {
+      async evaluate(_fn: any, arg?: any) {
+        // location lookup (no arg) -> no url, skip container resolution
+        if (arg === undefined) return '';
+        inFlight += 1;
+        maxInFlight = Math.max(maxInFlight, inFlight);
+        await new Promise((r) => setTimeout(r, 10));
+        inFlight -= 1;
+        log.push(`extract:${arg.selector}`);
+        return { success: true, count: 0, extracted: [], selector: arg.selector };
+      },
+      async goto(url: string) {
+        log.push(`goto:${url}`);
+      },
+    },
+  };
+  return { context, maxInFlight: () => maxInFlight };
+}
+
+test('executeParallel runs adjacent read-only operations concurrently and keeps order', async () => {
+  const executor = new ContainerExecutor();
+  const log: string[] = [];
+  const { context, maxInFlight } = createContext(log);
+
+  const results = await executor.executeParallel(
+    [
+      { containerId: 'a', operationId: 'extract', config: { selector: '.a' } },
+      { containerId: 'b', operationId: 'extract', config: { selector: '.b' } },
+      { containerId: 'c', operationId: 'navigate', config: { url: 'https://example.com/next' } },
+      { containerId: 'd', operationId: 'extract', config: { selector: '.d' } },
+    ],
+    context,
+  );
+
+  assert.equal(results.length, 4);
+  assert.equal((results[0] as any).selector, '.a');
+  assert.equal((results[1] as any).selector, '.b');
+  assert.equal(results[2].success, true);
+  assert.equal((results[3] as any).selector, '.d');
+  assert.equal(maxInFlight(), 2);
+  assert.deepEqual(log.slice(2), ['goto:https://example.com/next', 'extract:.d']);
+});
+
+test('execute reports operation errors but propagates cancellation', async () => {
+  const executor = new ContainerExecutor();
+  const { context } = createContext([]);
+  executor.registerOperation({
+    id: 'test:fail',
+    run: async () => {
+      throw null;
+    },
+  });
+  executor.registerOperation({
+    id: 'test:abort',
+    run: async () => {
+      const err = new Error('aborted');
+      err.name = 'AbortError';
+      throw err;
+    },
+  });
+
+  const failed = await executor.execute('a', 'test:fail', {}, context);
+  assert.equal(failed.success, false);
+  assert.equal(failed.error, 'null');
+
+  await assert.rejects(executor.execute('a', 'test:abort', {}, context), { name: 'AbortError' });
+});
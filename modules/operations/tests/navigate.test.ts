@@ -0,0 +1,54 @@
+import test from 'node:test';
+import assert from 'node:assert/strict';
+import { runNavigateOperation } from '../src/operations/navigate.js';
+
+function createPage(responseUrls: string[]) {
+  const calls: string[] = [];
+  return {
+    calls,
+    async evaluate() {
+      return null;
+    },
+    async goto(url: string) {
+      calls.push(`goto:${url}`);
+    },
+    async waitForResponse(predicate: (resp: any) => boolean, options: { timeout: number }) {
+      calls.push('waitForResponse');
+      const hit = responseUrls.find((url) => predicate({ url: () => url }));
+      if (!hit) throw new Error(`Timeout ${options.timeout}ms exceeded`);
+      return { url: () => hit };
+    },
+  };
+}
+
+test('navigate waits for matching response when wait_for_response is set', async () => {
+  const page = createPage(['https://example.com/static.js', 'https://example.com/api/feed?page=1']);
+  const result = await runNavigateOperation({ page } as any, {
+    url: 'https://example.com/home',
+    wait_for_response: '/api/feed',
+  });
+  assert.equal(result.success, true);
+  assert.deepEqual(page.calls, ['waitForResponse', 'goto:https://example.com/home']);
+});
+
+test('navigate fails when awaited response is not observed', async () => {
+  const page = createPage(['https://example.com/static.js']);
+  const result = await runNavigateOperation({ page } as any, {
+    url: 'https://example.com/home',
+    waitForResponse: '/api/feed',
+    waitForResponseTimeoutMs: 10,
+  });
+  assert.equal(result.success, false);
+  assert.match(String(result.error), /not observed/);
+});
+
+test('navigate rejects an invalid wait_for_response pattern before goto', async () => {
+  const page = createPage([]);
+  const result = await runNavigateOperation({ page } as any, {
+    url: 'https://example.com/home',
+    wait_for_response: '(',
+  });
+  assert.equal(result.success, false);
+  assert.match(String(result.error), /^navigate: invalid wait_for_response pattern: /);
+  assert.deepEqual(page.calls, []);
+});
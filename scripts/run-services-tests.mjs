@@ -43,27 +43,26 @@ async function main() {
   const cmd = existsSync(tsxBin)
     ? tsxBin
     : (process.platform === 'win32' ? 'npx.cmd' : 'npx');
-  let failed = false;
-  for (const testFile of tests) {
-    if (failed) break;
-    await new Promise((resolve) => {
-      const args = cmd === tsxBin
-        ? ['--test', testFile]
-        : ['tsx', '--test', testFile];
-      let spawnCmd = cmd;
-      let spawnArgs = args;
-      if (process.platform === 'win32' && /\.cmd$|\.bat$/i.test(cmd)) {
-        const quoted = /\s/.test(cmd) ? `"${cmd}"` : cmd;
-        spawnCmd = 'cmd.exe';
-        spawnArgs = ['/d', '/s', '/c', quoted, ...args];
-      }
-      const child = spawn(spawnCmd, spawnArgs, { stdio: 'inherit' });
-      child.on('exit', (code) => {
-        if ((code ?? 1) !== 0) failed = true;
-        resolve(null);
-      });
-    });
+  // 所有测试文件交给同一个 tsx --test 进程：由 node test runner 按文件并行调度到子进程，
+  // 不再逐个文件串行启动 tsx
+  // 单个用例的超时上限：卡死的异步用例直接失败，不拖住整个进程
+  const testTimeoutMs = Number(process.env.WEBAUTO_TEST_TIMEOUT_MS) || 60000;
+  const testArgs = ['--test', `--test-timeout=${testTimeoutMs}`, ...tests];
+  const args = cmd === tsxBin
+    ? testArgs
+    : ['tsx', ...testArgs];
+  let spawnCmd = cmd;
+  let spawnArgs = args;
+  if (process.platform === 'win32' && /\.cmd$|\.bat$/i.test(cmd)) {
+    const quoted = /\s/.test(cmd) ? `"${cmd}"` : cmd;
+    spawnCmd = 'cmd.exe';
+    spawnArgs = ['/d', '/s', '/c', quoted, ...args];
   }
+  const failed = await new Promise((resolve) => {
+    const child = spawn(spawnCmd, spawnArgs, { stdio: 'inherit' });
+    child.on('error', () => resolve(true));
+    child.on('exit', (code) => resolve((code ?? 1) !== 0));
+  });
   process.exit(failed ? 1 : 0);
 }
 
@@ -44,8 +44,11 @@ if (files.length === 0) {
   process.exit(0);
 }
 
+// 单个用例的超时上限：异步用例卡死时尽快失败，而不是拖住整个测试进程直到 CI 超时
+const testTimeoutMs = Number(process.env.WEBAUTO_TEST_TIMEOUT_MS) || 60000;
+
 const tsxEntry = path.join(ROOT, 'node_modules', 'tsx', 'dist', 'cli.mjs');
-const args = [tsxEntry, '--test', ...files];
+const args = [tsxEntry, '--test', `--test-timeout=${testTimeoutMs}`, ...files];
 const ret = spawnSync(process.execPath, args, { stdio: 'inherit', windowsHide: true });
 if (ret.error) {
   console.error(`[run-tests] failed to spawn tsx: ${ret.error.message}`);
@@ -12,6 +12,7 @@ import os from 'node:os';
 import fs from 'node:fs';
 import { fileURLToPath } from 'node:url';
 import { applyCamoEnv } from '../../apps/webauto/entry/lib/camo-env.mjs';
+import * as scheduleMod from '../../apps/webauto/entry/lib/schedule-store.mjs';
 import { RemoteSessionManager } from './RemoteSessionManager.js';
 import { ensureBuiltinOperations } from '../../modules/operations/src/builtin.js';
 import { getContainerExecutor } from '../../modules/operations/src/executor.js';
@@ -60,6 +61,24 @@ const cliTargets = {
 
 startHeartbeatWatcher({ serviceName: 'unified-api' });
 
+// 订阅 topic 通配模式（* / ?）编译结果按模式缓存；每次广播都要对所有订阅匹配，避免重复 new RegExp
+const TOPIC_PATTERN_CACHE_LIMIT = 512;
+const topicPatternCache = new Map<string, RegExp>();
+
+function compileTopicPattern(pattern: string): RegExp {
+  let compiled = topicPatternCache.get(pattern);
+  if (!compiled) {
+    const regexPattern = pattern
+      .replace(/[.+^${}()|[\]\\]/g, '\\$&')
+      .replace(/\*/g, '.*')
+      .replace(/\?/g, '.');
+    compiled = new RegExp(`^${regexPattern}$`);
+    if (topicPatternCache.size >= TOPIC_PATTERN_CACHE_LIMIT) topicPatternCache.clear();
+    topicPatternCache.set(pattern, compiled);
+  }
+  return compiled;
+}
+
 class UnifiedApiServer {
   private controller: UiController;
   private wsClients: Set<WebSocket>;
@@ -207,11 +226,7 @@ class UnifiedApiServer {
   }
 
   private matchesTopic(pattern: string, topic: string) {
-    const regexPattern = pattern
-      .replace(/[.+^${}()|[\]\\]/g, '\\$&')
-      .replace(/\*/g, '.*')
-      .replace(/\?/g, '.');
-    return new RegExp(`^${regexPattern}$`).test(topic);
+    return compileTopicPattern(pattern).test(topic);
   }
 
   private shouldDeliver(socket: WebSocket, topic: string) {
@@ -651,7 +666,6 @@ class UnifiedApiServer {
       const scheduleBase = '/api/v1/schedules';
       if (url.pathname === scheduleBase || url.pathname === scheduleBase + '/') {
         try {
-          const scheduleMod = await import('../../apps/webauto/entry/lib/schedule-store.mjs');
           if (req.method === 'GET') {
             const result = scheduleMod.listScheduleTasks();
             res.writeHead(200, { 'Content-Type': 'application/json' });
@@ -677,7 +691,6 @@ class UnifiedApiServer {
       const scheduleIdMatch = url.pathname.match(/^\/api\/v1\/schedules\/([^/]+)$/);
       if (scheduleIdMatch) {
         try {
-          const scheduleMod = await import('../../apps/webauto/entry/lib/schedule-store.mjs');
           const taskId = decodeURIComponent(scheduleIdMatch[1]);
           if (req.method === 'GET') {
             const task = scheduleMod.getScheduleTask(taskId);
@@ -707,7 +720,6 @@ class UnifiedApiServer {
       // POST /api/v1/schedules/run-due
       if (url.pathname === '/api/v1/schedules/run-due' && req.method === 'POST') {
         try {
-          const scheduleMod = await import('../../apps/webauto/entry/lib/schedule-store.mjs');
           const due = scheduleMod.listDueScheduleTasks(20);
           res.writeHead(200, { 'Content-Type': 'application/json' });
           res.end(JSON.stringify({ success: true, data: due }));
@@ -723,7 +735,6 @@ class UnifiedApiServer {
       if (scheduleRunMatch && req.method === 'POST') {
         try {
           const taskId = decodeURIComponent(scheduleRunMatch[1]);
-          const scheduleMod = await import('../../apps/webauto/entry/lib/schedule-store.mjs');
           const task = scheduleMod.getScheduleTask(taskId);
           res.writeHead(200, { 'Content-Type': 'application/json' });
           res.end(JSON.stringify({ success: true, data: { taskId, claimed: true, task } }));
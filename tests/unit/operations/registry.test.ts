@@ -4,7 +4,13 @@
 
 import { describe, it } from 'node:test';
 import assert from 'node:assert/strict';
-import { registerOperation, getOperation, listOperations } from '../../../modules/operations/src/registry.js';
+import {
+  registerOperation,
+  getOperation,
+  listOperations,
+  describeOperation,
+  listOperationDescriptions,
+} from '../../../modules/operations/src/registry.js';
 
 describe('OperationRegistry', () => {
   it('should register and retrieve an operation', () => {
@@ -34,6 +40,20 @@ describe('OperationRegistry', () => {
     assert.ok(ops.length >= 1); // At least our test-op should be there
   });
 
+  it('should describe registered operations without run handler', () => {
+    registerOperation({
+      id: 'describe-op',
+      description: 'Describe operation',
+      requiredCapabilities: ['scroll'],
+      run: async () => ({ success: true }),
+    });
+    const desc = describeOperation('describe-op');
+    assert.deepEqual(desc, { id: 'describe-op', description: 'Describe operation', requiredCapabilities: ['scroll'] });
+    assert.equal(describeOperation('describe-op'), desc);
+    assert.ok(listOperationDescriptions().some((item) => item.id === 'describe-op'));
+    assert.equal(describeOperation('non-existent'), undefined);
+  });
+
   it('should run operation with context and config', async () => {
     const testOp = {
       id: 'run-test',
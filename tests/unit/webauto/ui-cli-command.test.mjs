@@ -1,58 +1,72 @@
-import test from 'node:test';
+import { describe, it } from 'node:test';
 import assert from 'node:assert/strict';
-import { spawnSync } from 'node:child_process';
+import { spawn } from 'node:child_process';
 import path from 'node:path';
 
 const ROOT = path.resolve(import.meta.dirname, '../../..');
 const BIN = path.join(ROOT, 'bin', 'webauto.mjs');
 
+// 各用例只读 help 输出、互不依赖：子进程异步启动并发执行，相同参数只启动一次
+const runs = new Map();
+
 function run(args) {
-  return spawnSync(process.execPath, [BIN, ...args], {
-    cwd: ROOT,
-    encoding: 'utf8',
-  });
+  const key = args.join('\0');
+  if (!runs.has(key)) {
+    runs.set(key, new Promise((resolve, reject) => {
+      const child = spawn(process.execPath, [BIN, ...args], { cwd: ROOT });
+      let stdout = '';
+      let stderr = '';
+      child.stdout.setEncoding('utf8').on('data', (chunk) => { stdout += chunk; });
+      child.stderr.setEncoding('utf8').on('data', (chunk) => { stderr += chunk; });
+      child.on('error', reject);
+      child.on('close', (status) => resolve({ status, stdout, stderr }));
+    }));
+  }
+  return runs.get(key);
 }
 
-test('webauto --help prints main help', () => {
-  const ret = run(['--help']);
-  assert.equal(ret.status, 0, ret.stderr || ret.stdout);
-  assert.match(ret.stdout, /webauto CLI/);
-  assert.match(ret.stdout, /webauto xhs/);
-  assert.match(ret.stdout, /webauto schedule/);
-  assert.match(ret.stdout, /webauto account/);
-  assert.match(ret.stdout, /webauto deps/);
-});
+describe('webauto cli help', { concurrency: true }, () => {
+  it('webauto --help prints main help', async () => {
+    const ret = await run(['--help']);
+    assert.equal(ret.status, 0, ret.stderr || ret.stdout);
+    assert.match(ret.stdout, /webauto CLI/);
+    assert.match(ret.stdout, /webauto xhs/);
+    assert.match(ret.stdout, /webauto schedule/);
+    assert.match(ret.stdout, /webauto account/);
+    assert.match(ret.stdout, /webauto deps/);
+  });
 
-test('webauto (no args) shows help instead of launching UI', () => {
-  const ret = run([]);
-  assert.equal(ret.status, 0, ret.stderr || ret.stdout);
-  assert.match(ret.stdout, /webauto CLI/);
-});
+  it('webauto (no args) shows help instead of launching UI', async () => {
+    const ret = await run([]);
+    assert.equal(ret.status, 0, ret.stderr || ret.stdout);
+    assert.match(ret.stdout, /webauto CLI/);
+  });
 
-test('webauto xhs --help prints xhs usage', () => {
-  const ret = run(['xhs', '--help']);
-  assert.equal(ret.status, 0, ret.stderr || ret.stdout);
-  assert.match(ret.stdout, /webauto xhs/);
-  assert.match(ret.stdout, /unified/);
-  assert.match(ret.stdout, /collect/);
-  assert.match(ret.stdout, /status/);
-});
+  it('webauto xhs --help prints xhs usage', async () => {
+    const ret = await run(['xhs', '--help']);
+    assert.equal(ret.status, 0, ret.stderr || ret.stdout);
+    assert.match(ret.stdout, /webauto xhs/);
+    assert.match(ret.stdout, /unified/);
+    assert.match(ret.stdout, /collect/);
+    assert.match(ret.stdout, /status/);
+  });
 
-test('webauto daemon --help prints daemon usage', () => {
-  const ret = run(['daemon', '--help']);
-  assert.equal(ret.status, 0, ret.stderr || ret.stdout);
-  assert.match(ret.stdout, /webauto daemon/);
-  // relay should not appear in help
-  assert.ok(!ret.stdout.includes('relay'), 'daemon help should not mention relay');
-});
+  it('webauto daemon --help prints daemon usage', async () => {
+    const ret = await run(['daemon', '--help']);
+    assert.equal(ret.status, 0, ret.stderr || ret.stdout);
+    assert.match(ret.stdout, /webauto daemon/);
+    // relay should not appear in help
+    assert.ok(!ret.stdout.includes('relay'), 'daemon help should not mention relay');
+  });
 
-test('webauto help output has no UI references', () => {
-  const ret = run(['--help']);
-  assert.equal(ret.status, 0, ret.stderr || ret.stdout);
-  // UI-related commands should not appear
-  assert.ok(!ret.stdout.includes('ui console'), 'help should not mention ui console');
-  assert.ok(!ret.stdout.includes('ui cli'), 'help should not mention ui cli');
-  assert.ok(!ret.stdout.includes('desktop-console'), 'help should not mention desktop-console');
-  assert.ok(!ret.stdout.includes('electron'), 'help should not mention electron');
-  assert.ok(!ret.stdout.includes('relay'), 'help should not mention relay');
+  it('webauto help output has no UI references', async () => {
+    const ret = await run(['--help']);
+    assert.equal(ret.status, 0, ret.stderr || ret.stdout);
+    // UI-related commands should not appear
+    assert.ok(!ret.stdout.includes('ui console'), 'help should not mention ui console');
+    assert.ok(!ret.stdout.includes('ui cli'), 'help should not mention ui cli');
+    assert.ok(!ret.stdout.includes('desktop-console'), 'help should not mention desktop-console');
+    assert.ok(!ret.stdout.includes('electron'), 'help should not mention electron');
+    assert.ok(!ret.stdout.includes('relay'), 'help should not mention relay');
+  });
 });